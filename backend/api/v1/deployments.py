@@ -15,7 +15,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from db import USING_POSTGRES, get_connection, list_columns
-from api.v1.nodes import execute_flow as run_execute_endpoint
+from api.v1.nodes import run_flow
+from api.v1.workflows import invalidate_workflow_list
 
 
 router = APIRouter(prefix="/deployments", tags=["deployments"])
@@ -303,7 +304,9 @@ async def create_deployment(payload: CreateDeploymentIn):
             raise HTTPException(status_code=404, detail="Workflow not found")
 
         try:
-            data = json.loads(wf["data_json"])  # saved react-flow graph
+            data = wf["data_json"]  # saved react-flow graph (already decoded from JSONB on Postgres)
+            if isinstance(data, str):
+                data = json.loads(data)
         except Exception:
             raise HTTPException(status_code=400, detail="Saved workflow data is invalid JSON")
 
@@ -353,6 +356,7 @@ async def create_deployment(payload: CreateDeploymentIn):
             )
             if not USING_POSTGRES:
                 conn.commit()
+            invalidate_workflow_list()
             return {"success": True, "data": {"id": dep_id, "invoke_url": f"/api/v1/deployments/{dep_id}/invoke", "updated": True}}
         else:
             # Create new deployment
@@ -376,6 +380,7 @@ async def create_deployment(payload: CreateDeploymentIn):
             )
         if not USING_POSTGRES:
             conn.commit()
+        invalidate_workflow_list()
         return {"success": True, "data": {"id": dep_id, "invoke_url": f"/api/v1/deployments/{dep_id}/invoke", "updated": False}}
 
 
@@ -500,7 +505,9 @@ async def get_deployment_by_workflow(workflow_id: str):
         # Only check for changes if workflow_hash column exists
         if workflow and "workflow_hash" in available_columns:
             try:
-                current_data = json.loads(workflow["data_json"])
+                current_data = workflow["data_json"]
+                if isinstance(current_data, str):
+                    current_data = json.loads(current_data)
                 current_hash = compute_workflow_hash(current_data)
                 stored_hash = deployment["workflow_hash"] if "workflow_hash" in deployment.keys() else None
                 has_changes = stored_hash is None or current_hash != stored_hash
@@ -563,7 +570,7 @@ async def invoke_deployment(deployment_id: str, payload: InvokeIn):
 
     try:
         # Delegate to existing executor logic
-        result = await run_execute_endpoint(run_payload)
+        result = await run_flow(run_payload)
         response_data = result
         return result
     except Exception as exc:
@@ -608,6 +615,7 @@ async def toggle_deployment(deployment_id: str):
         )
         if not USING_POSTGRES:
             conn.commit()
+    invalidate_workflow_list()
     return {"success": True, "data": {"is_active": new_status}}
 
 
@@ -632,6 +640,7 @@ async def update_deployment_status(deployment_id: str, is_active: bool):
         )
         if not USING_POSTGRES:
             conn.commit()
+    invalidate_workflow_list()
     return {"success": True, "data": {"is_active": 1 if is_active else 0}}
 
 
@@ -654,6 +663,7 @@ async def delete_deployment(deployment_id: str):
         )
         if not USING_POSTGRES:
             conn.commit()
+    invalidate_workflow_list()
     return {"success": True}
 
 
@@ -2,24 +2,37 @@
 File Upload API - Handle file uploads for DocumentLoaderNode
 
 Automatic Cleanup:
-- Files older than 7 days are automatically deleted on server startup
+- Files older than 7 days are automatically deleted in the background on server startup
 - Files are deleted when replaced with a new upload
 - Files are deleted when user clicks "Remove" button
-- Manual cleanup can be triggered via POST /api/v1/files/cleanup
+- Manual cleanup can be queued via POST /api/v1/files/cleanup
 - Storage stats available at GET /api/v1/files/stats
 
 This prevents disk space from filling up with orphaned files.
 """
 
+import asyncio
+import heapq
+import io
 import os
-import uuid
+import secrets
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from stat import S_ISREG
+from typing import AsyncIterator, BinaryIO, Deque, Dict, Any, List, Optional, Tuple
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser as FormMultiPartParser
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
 
 router = APIRouter()
 
@@ -27,15 +40,84 @@ router = APIRouter()
 UPLOAD_DIR = Path(__file__).parent.parent.parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Absolute upload directory, resolved once so responses don't hit getcwd() per request
+_UPLOAD_DIR_ABS = str(UPLOAD_DIR.resolve()) + os.sep
+
+# Uploads are sharded into subdirectories named after the first characters of the stored
+# name (UPLOAD_DIR/ab/ab12....pdf), keeping per-directory entry counts small
+SHARD_PREFIX_LEN = 2
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt", ".md", ".markdown"}
 
+# Allowed extensions as a tuple, so str.endswith can check them all in one C-level call
+_ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)
+
 # Maximum file size (10 MB)
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Allowance for multipart boundaries and part headers when checking Content-Length
+MULTIPART_OVERHEAD = 16 * 1024
+
+# Bodies up to this size are read in one go and parsed in memory, skipping the upload spool
+SMALL_UPLOAD_THRESHOLD = 1024 * 1024
+
+# Multipart form field carrying the uploaded file
+UPLOAD_FIELD_NAME = "file"
+
+# Upload copy chunk size (64 KB)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Zero-copy transfer of rolled-over spool files where the platform supports it
+_HAS_SENDFILE = hasattr(os, "sendfile")
+
+# Pool of preallocated copy buffers shared by concurrent uploads, so in-memory spools are
+# copied without allocating a fresh buffer per request. A plain deque isn't tied to an
+# event loop; when it runs dry an upload just allocates its own buffer.
+UPLOAD_BUFFER_POOL_SIZE = 16
+_BUF_POOL: Deque[bytearray] = deque(bytearray(UPLOAD_CHUNK_SIZE) for _ in range(UPLOAD_BUFFER_POOL_SIZE))
+
 # File retention period (7 days)
 FILE_RETENTION_DAYS = 7
 
+# Optional storage caps: when set, cleanup also evicts the oldest files until at most
+# MAX_STORED_FILES files / MAX_STORED_BYTES bytes remain (None disables the cap)
+MAX_STORED_FILES: Optional[int] = None
+MAX_STORED_BYTES: Optional[int] = None
+
+# Background cleanup: triggers within this window share a single run
+CLEANUP_COALESCE_SECONDS = 10
+
+# Number of files unlinked per batch before yielding back to the event loop
+CLEANUP_BATCH_SIZE = 32
+
+# Thread pool used to scan shards and overlap unlink() calls during cleanup
+CLEANUP_WORKERS = 8
+_fs_executor = ThreadPoolExecutor(max_workers=CLEANUP_WORKERS, thread_name_prefix="files-fs")
+
+# Cleanup request queue and its consumer task (started from the app lifespan)
+_cleanup_queue: Optional["asyncio.Queue[float]"] = None
+_cleanup_task: Optional["asyncio.Task[None]"] = None
+
+# In-memory index of uploaded files: stored_name -> (size, mtime, ctime).
+# Built by a single directory scan on first use, then kept current by upload/delete/cleanup
+# so /files/stats doesn't need to re-scan the directory. Cleanup runs in worker threads,
+# hence a threading lock rather than an asyncio one.
+#
+# The index assumes a single process owns UPLOAD_DIR: with several workers, each one only
+# sees its own uploads and deletions until it restarts, so run the API as one process.
+_file_index: Dict[str, Tuple[int, float, float]] = {}
+_file_index_ready = False
+_file_index_lock = threading.Lock()
+
+# Oldest mtime in the index, so cleanup can bail out without scanning when nothing is stale
+_min_mtime = float("inf")
+
+
+def _format_timestamp(timestamp: float) -> str:
+    """Format an epoch timestamp as a local ISO-8601 string (second precision)"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp))
+
 
 def get_file_extension(filename: str) -> str:
     """Get the file extension from filename"""
@@ -44,62 +126,305 @@ def get_file_extension(filename: str) -> str:
 
 def is_allowed_file(filename: str) -> bool:
     """Check if file extension is allowed"""
-    return get_file_extension(filename) in ALLOWED_EXTENSIONS
+    name = filename.lower()
+    if not name.endswith(_ALLOWED_SUFFIXES):
+        return False
+    # A bare ".md" (no stem) has no suffix, as with Path.suffix
+    dot = name.rfind(".")
+    return dot > 0 and name[dot - 1] != "/"
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of the spooled upload, without reading its content"""
+    if file.size is not None:
+        return file.size
+    src = file.file
+    position = src.tell()
+    size = src.seek(0, os.SEEK_END)
+    src.seek(position)
+    return size
+
+
+def _borrow_buffer() -> bytearray:
+    """Take a copy buffer from the pool, or allocate one if the pool is empty"""
+    try:
+        return _BUF_POOL.pop()
+    except IndexError:
+        return bytearray(UPLOAD_CHUNK_SIZE)
+
+
+def _return_buffer(buf: bytearray) -> None:
+    """Give a copy buffer back to the pool, dropping it if the pool is already full"""
+    if len(_BUF_POOL) < UPLOAD_BUFFER_POOL_SIZE:
+        _BUF_POOL.append(buf)
+
+
+def _copy_upload(src: BinaryIO, dest_path: str, size: int, buf: bytearray) -> None:
+    """
+    Copy a spooled upload into dest_path.
+
+    When the spool has rolled over to a real temp file, os.sendfile copies it inside the
+    kernel. In-memory spools, and platforms where sendfile can't target a regular file
+    (macOS raises ENOTSOCK), are copied with readinto() through buf, a buffer borrowed
+    from the pool.
+    """
+    src.seek(0)
+    fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # A SpooledTemporaryFile's _file is a BytesIO until it rolls over; calling fileno()
+        # on it would force that rollover, so only real files are handed to sendfile
+        if _HAS_SENDFILE and not isinstance(getattr(src, "_file", src), io.BytesIO):
+            offset = 0
+            try:
+                src_fd = src.fileno()
+                while offset < size:
+                    sent = os.sendfile(fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                # Finish with the readinto() loop from wherever sendfile stopped
+                src.seek(offset)
+
+        view = memoryview(buf)
+        while n := src.readinto(buf):
+            written = 0
+            while written < n:
+                written += os.write(fd, view[written:n])
+    finally:
+        os.close(fd)
+
+
+def _write_upload_bytes(dest_path: str, data: bytes) -> None:
+    """Write an in-memory upload to dest_path, normally with a single os.write()"""
+    fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+    finally:
+        os.close(fd)
+
+
+def _parse_small_multipart(body: bytes, content_type: str) -> Tuple[Optional[str], bytes]:
+    """
+    Pull the UPLOAD_FIELD_NAME part out of a fully buffered multipart body.
+
+    Returns (filename, data); filename is None when the body carries no such file part.
+    """
+    _, options = parse_options_header(content_type)
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=400, detail="Invalid multipart body")
+
+    header_field = bytearray()
+    header_value = bytearray()
+    disposition = b""
+    capturing = False
+    found: Dict[str, Any] = {"filename": None, "chunks": []}
+
+    def on_part_begin() -> None:
+        nonlocal disposition
+        disposition = b""
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        nonlocal disposition
+        if header_field.lower() == b"content-disposition":
+            disposition = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished() -> None:
+        nonlocal capturing
+        _, params = parse_options_header(disposition)
+        capturing = (
+            found["filename"] is None
+            and params.get(b"name") == UPLOAD_FIELD_NAME.encode()
+            and b"filename" in params
+        )
+        if capturing:
+            found["filename"] = params[b"filename"].decode("utf-8", "replace")
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if capturing:
+            found["chunks"].append(data[start:end])
+
+    def on_part_end() -> None:
+        nonlocal capturing
+        capturing = False
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        parser.write(body)
+        parser.finalize()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid multipart body")
+
+    chunks = found["chunks"]
+    return found["filename"], chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024} MB"
+    )
+
 
+async def _limited_stream(request: Request) -> AsyncIterator[bytes]:
+    """
+    Yield the request body, aborting with 413 once it passes the upload limit.
 
-@router.post("/files/upload")
-async def upload_file(file: UploadFile = File(...)) -> Dict[str, Any]:
+    Chunked bodies carry no Content-Length to check up front, so the limit is enforced
+    on the running byte count while reading.
+    """
+    limit = MAX_FILE_SIZE + MULTIPART_OVERHEAD
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise _too_large()
+        yield chunk
+
+
+def _shard_relpath(stored_name: str) -> str:
+    """Path of a stored file relative to UPLOAD_DIR in the sharded layout"""
+    return f"{stored_name[:SHARD_PREFIX_LEN]}{os.sep}{stored_name}"
+
+
+def _locate_stored_file(stored_name: str) -> str:
+    """Relative path of a stored file, falling back to the flat layout used before sharding"""
+    sharded = _shard_relpath(stored_name)
+    if os.path.isfile(_UPLOAD_DIR_ABS + sharded):
+        return sharded
+    return stored_name
+
+
+@router.post("/files/upload", openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [UPLOAD_FIELD_NAME],
+                    "properties": {UPLOAD_FIELD_NAME: {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+})
+async def upload_file(request: Request) -> Dict[str, Any]:
     """
     Upload a file for use in DocumentLoaderNode
 
+    The multipart body is read directly from the request: small bodies are buffered once
+    and the file part is written with a single os.write(), larger ones go through
+    Starlette's spooled form parser. Every size rejection is a 413.
+
     Args:
-        file: The uploaded file
+        request: The incoming multipart/form-data request with a "file" field
 
     Returns:
         Dictionary with file metadata and path
     """
+    form = None
     try:
-        # Validate file
-        if not file.filename:
+        # Reject requests that announce an oversized body before doing any work on them
+        content_length = request.headers.get("content-length")
+        body_size = int(content_length) if content_length and content_length.isdigit() else None
+        if body_size is not None and body_size > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+            raise _too_large()
+
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
             raise HTTPException(status_code=400, detail="No file provided")
 
-        if not is_allowed_file(file.filename):
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
-            )
+        data: Optional[bytes] = None
+        file: Optional[UploadFile] = None
+        if body_size is not None and body_size <= SMALL_UPLOAD_THRESHOLD:
+            filename, data = _parse_small_multipart(await request.body(), content_type)
+        else:
+            try:
+                form = await FormMultiPartParser(request.headers, _limited_stream(request)).parse()
+            except MultiPartException:
+                raise HTTPException(status_code=400, detail="Invalid multipart body")
+            upload = form.get(UPLOAD_FIELD_NAME)
+            if isinstance(upload, UploadFile):
+                file = upload
+            filename = file.filename if file else None
 
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        # Validate file
+        if not filename:
+            raise HTTPException(status_code=400, detail="No file provided")
 
-        # Check file size
-        if file_size > MAX_FILE_SIZE:
+        if not is_allowed_file(filename):
             raise HTTPException(
                 status_code=400,
-                detail=f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024} MB"
+                detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
 
         # Generate unique filename
-        file_ext = get_file_extension(file.filename)
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = UPLOAD_DIR / unique_filename
+        file_ext = get_file_extension(filename)
+        unique_filename = secrets.token_hex(16) + file_ext
+        relative_path = _shard_relpath(unique_filename)
+        file_path = _UPLOAD_DIR_ABS + relative_path
 
-        # Save file
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Check file size before touching the destination
+        file_size = len(data) if data is not None else _upload_size(file)
+        if file_size > MAX_FILE_SIZE:
+            raise _too_large()
+
+        # Only a validated upload gets a shard directory
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        if data is not None:
+            try:
+                await asyncio.to_thread(_write_upload_bytes, file_path, data)
+            except BaseException:
+                _unlink_quietly(file_path)
+                raise
+        else:
+            # Copy the spooled upload to its destination off the event loop
+            buf = _borrow_buffer()
+            try:
+                await asyncio.to_thread(_copy_upload, file.file, file_path, file_size, buf)
+            except BaseException:
+                _unlink_quietly(file_path)
+                raise
+            finally:
+                _return_buffer(buf)
+
+        uploaded_at = time.time()
+        _index_add(unique_filename, file_size, uploaded_at, uploaded_at)
 
         # Return file metadata
         return {
             "success": True,
             "file": {
-                "filename": file.filename,
-                "original_name": file.filename,
+                "filename": filename,
+                "original_name": filename,
                 "stored_name": unique_filename,
-                "path": str(file_path.absolute()),
+                "path": file_path,
                 "size": file_size,
                 "extension": file_ext,
-                "uploaded_at": datetime.now().isoformat()
+                "uploaded_at": _format_timestamp(uploaded_at)
             }
         }
 
@@ -107,6 +432,9 @@ async def upload_file(file: UploadFile = File(...)) -> Dict[str, Any]:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+    finally:
+        if form is not None:
+            await form.close()
 
 
 @router.delete("/files/{filename}")
@@ -121,13 +449,14 @@ async def delete_file(filename: str) -> Dict[str, Any]:
         Success status
     """
     try:
-        file_path = UPLOAD_DIR / filename
+        file_path = _UPLOAD_DIR_ABS + _locate_stored_file(filename)
 
-        if not file_path.exists():
+        if not os.path.isfile(file_path):
             raise HTTPException(status_code=404, detail="File not found")
 
         # Delete file
-        file_path.unlink()
+        os.unlink(file_path)
+        _index_remove(filename)
 
         return {
             "success": True,
@@ -152,22 +481,26 @@ async def get_file_info(filename: str) -> Dict[str, Any]:
         File metadata
     """
     try:
-        file_path = UPLOAD_DIR / filename
-
-        if not file_path.exists():
+        # One stat per candidate location (sharded first, then the legacy flat layout)
+        for file_path in (_UPLOAD_DIR_ABS + _shard_relpath(filename), _UPLOAD_DIR_ABS + filename):
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            if S_ISREG(stat.st_mode):
+                break
+        else:
             raise HTTPException(status_code=404, detail="File not found")
 
-        stat = file_path.stat()
-
         return {
             "success": True,
             "file": {
                 "stored_name": filename,
-                "path": str(file_path.absolute()),
+                "path": file_path,
                 "size": stat.st_size,
-                "extension": file_path.suffix.lower(),
-                "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                "extension": get_file_extension(filename),
+                "created_at": _format_timestamp(stat.st_ctime),
+                "modified_at": _format_timestamp(stat.st_mtime)
             }
         }
 
@@ -177,6 +510,172 @@ async def get_file_info(filename: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to get file info: {str(e)}")
 
 
+def _scan_dir(path: str, shard_dirs: Optional[List[str]] = None) -> List[Tuple[str, str, int, float, float]]:
+    """
+    Scan one directory, returning (name, path, size, mtime, ctime) for each uploaded file.
+
+    If shard_dirs is given, shard subdirectories found along the way are appended to it.
+    """
+    found: List[Tuple[str, str, int, float, float]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # Name-only prefilter first (also skips .gitkeep): stat is a syscall, this isn't
+            if entry.name.endswith(_ALLOWED_SUFFIXES):
+                if entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    found.append((entry.name, entry.path, stat.st_size, stat.st_mtime, stat.st_ctime))
+            elif (
+                shard_dirs is not None
+                and len(entry.name) == SHARD_PREFIX_LEN
+                and entry.is_dir(follow_symlinks=False)
+            ):
+                shard_dirs.append(entry.path)
+    return found
+
+
+def _scan_upload_tree() -> List[Tuple[str, str, int, float, float]]:
+    """Scan UPLOAD_DIR (legacy flat files) and every shard, shards in parallel"""
+    shard_dirs: List[str] = []
+    found = _scan_dir(str(UPLOAD_DIR), shard_dirs)
+    for shard_files in _fs_executor.map(_scan_dir, shard_dirs):
+        found.extend(shard_files)
+    return found
+
+
+def _scan_upload_dir() -> Dict[str, Tuple[int, float, float]]:
+    """Scan the upload tree once, returning stored_name -> (size, mtime, ctime)"""
+    return {name: (size, mtime, ctime) for name, _, size, mtime, ctime in _scan_upload_tree()}
+
+
+def _recompute_min_mtime() -> None:
+    """Rebuild _min_mtime from the index; caller must hold _file_index_lock"""
+    global _min_mtime
+    _min_mtime = min((entry[1] for entry in _file_index.values()), default=float("inf"))
+
+
+def _ensure_file_index() -> None:
+    """Populate the in-memory file index from disk if it hasn't been built yet"""
+    global _file_index_ready
+
+    if _file_index_ready:
+        return
+    scanned = _scan_upload_dir()
+    with _file_index_lock:
+        if not _file_index_ready:
+            _file_index.update(scanned)
+            _recompute_min_mtime()
+            _file_index_ready = True
+
+
+def _index_add(name: str, size: int, mtime: float, ctime: float) -> None:
+    global _min_mtime
+    with _file_index_lock:
+        _file_index[name] = (size, mtime, ctime)
+        if mtime < _min_mtime:
+            _min_mtime = mtime
+
+
+def _index_remove(*names: str) -> None:
+    with _file_index_lock:
+        removed_oldest = False
+        for name in names:
+            entry = _file_index.pop(name, None)
+            if entry is not None and entry[1] <= _min_mtime:
+                removed_oldest = True
+        if removed_oldest:
+            _recompute_min_mtime()
+
+
+def _storage_capped() -> bool:
+    return MAX_STORED_FILES is not None or MAX_STORED_BYTES is not None
+
+
+def _over_capacity(file_count: int, total_bytes: int) -> bool:
+    return (
+        (MAX_STORED_FILES is not None and file_count > MAX_STORED_FILES)
+        or (MAX_STORED_BYTES is not None and total_bytes > MAX_STORED_BYTES)
+    )
+
+
+def _nothing_expired(cutoff_time: float) -> bool:
+    """True when the index proves no file is older than cutoff_time or over the caps"""
+    if not _file_index_ready or _min_mtime < cutoff_time:
+        return False
+    if not _storage_capped():
+        return True
+    with _file_index_lock:
+        sizes = [entry[0] for entry in _file_index.values()]
+    return not _over_capacity(len(sizes), sum(sizes))
+
+
+def _select_victims(
+    scanned: List[Tuple[str, str, int, float, float]], cutoff_time: float
+) -> Tuple[List[Tuple[str, int]], Dict[str, Tuple[int, float, float]]]:
+    """
+    Split scanned files into (victims, survivors).
+
+    Victims are files older than cutoff_time plus, when a storage cap is set, the oldest
+    of the remaining files until the rest fit under it.
+    """
+    victims: List[Tuple[str, int]] = []
+    kept: List[Tuple[str, str, int, float, float]] = []
+    kept_bytes = 0
+    for entry in scanned:
+        if entry[3] < cutoff_time:
+            victims.append((entry[1], entry[2]))
+        else:
+            kept.append(entry)
+            kept_bytes += entry[2]
+
+    if _over_capacity(len(kept), kept_bytes):
+        kept.sort(key=lambda entry: entry[3])
+        evicted = 0
+        while evicted < len(kept) and _over_capacity(len(kept) - evicted, kept_bytes):
+            _, path, size, _, _ = kept[evicted]
+            kept_bytes -= size
+            victims.append((path, size))
+            evicted += 1
+        kept = kept[evicted:]
+
+    return victims, {name: (size, mtime, ctime) for name, _, size, mtime, ctime in kept}
+
+
+def _find_expired_files(cutoff_time: float) -> List[Tuple[str, int]]:
+    """Return (path, size) for every uploaded file to evict: expired or over the caps"""
+    return _select_victims(_scan_upload_tree(), cutoff_time)[0]
+
+
+def _unlink_quietly(path: str) -> bool:
+    """Unlink path, returning False if it was already gone"""
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _delete_files(files: List[Tuple[str, int]]) -> Tuple[int, int]:
+    """Unlink the given (path, size) pairs in parallel, returning (deleted_count, deleted_size)"""
+    removed = _fs_executor.map(_unlink_quietly, [path for path, _ in files])
+    deleted_count = 0
+    deleted_size = 0
+    for (_, size), was_removed in zip(files, removed):
+        if was_removed:
+            deleted_count += 1
+            deleted_size += size
+    _index_remove(*(os.path.basename(path) for path, _ in files))
+    return deleted_count, deleted_size
+
+
+def _cleanup_result(deleted_count: int, deleted_size: int) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "deleted_count": deleted_count,
+        "deleted_size": deleted_size,
+        "message": f"Cleaned up {deleted_count} files ({deleted_size / 1024:.2f} KB)"
+    }
+
+
 def cleanup_old_files() -> Dict[str, Any]:
     """
     Clean up files older than FILE_RETENTION_DAYS
@@ -185,29 +684,71 @@ def cleanup_old_files() -> Dict[str, Any]:
         Dictionary with cleanup results
     """
     try:
-        deleted_count = 0
-        deleted_size = 0
         cutoff_time = time.time() - (FILE_RETENTION_DAYS * 24 * 60 * 60)
+        if _nothing_expired(cutoff_time):
+            return _cleanup_result(0, 0)
 
-        for file_path in UPLOAD_DIR.glob("*"):
-            # Skip .gitkeep
-            if file_path.name == ".gitkeep":
-                continue
+        deleted_count, deleted_size = _delete_files(_find_expired_files(cutoff_time))
+        return _cleanup_result(deleted_count, deleted_size)
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Cleanup failed: {str(e)}"
+        }
 
-            # Check if file is older than retention period
-            if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-                file_size = file_path.stat().st_size
-                file_path.unlink()
-                deleted_count += 1
-                deleted_size += file_size
 
+async def _cleanup_old_files_batched() -> Dict[str, Any]:
+    """
+    Async variant of cleanup_old_files that keeps filesystem work off the event loop.
+
+    The directory scan runs in a worker thread, and unlinks are issued in batches of
+    CLEANUP_BATCH_SIZE so other requests get a chance to run in between.
+    """
+    try:
+        cutoff_time = time.time() - (FILE_RETENTION_DAYS * 24 * 60 * 60)
+        if _nothing_expired(cutoff_time):
+            return _cleanup_result(0, 0)
+
+        expired = await asyncio.to_thread(_find_expired_files, cutoff_time)
+
+        deleted_count = 0
+        deleted_size = 0
+        for i in range(0, len(expired), CLEANUP_BATCH_SIZE):
+            count, size = await asyncio.to_thread(_delete_files, expired[i:i + CLEANUP_BATCH_SIZE])
+            deleted_count += count
+            deleted_size += size
+
+        return _cleanup_result(deleted_count, deleted_size)
+
+    except Exception as e:
         return {
-            "success": True,
-            "deleted_count": deleted_count,
-            "deleted_size": deleted_size,
-            "message": f"Cleaned up {deleted_count} files ({deleted_size / 1024:.2f} KB)"
+            "success": False,
+            "error": f"Cleanup failed: {str(e)}"
         }
 
+
+def cleanup_and_index_uploads() -> Dict[str, Any]:
+    """
+    Startup sweep: one pass over the upload tree that deletes expired files and builds
+    the in-memory index from the survivors, so no file is stat'ed twice.
+    """
+    global _file_index_ready
+
+    try:
+        cutoff_time = time.time() - (FILE_RETENTION_DAYS * 24 * 60 * 60)
+        expired, survivors = _select_victims(_scan_upload_tree(), cutoff_time)
+
+        deleted_count, deleted_size = _delete_files(expired)
+
+        with _file_index_lock:
+            if not _file_index_ready:
+                _file_index.update(survivors)
+                _recompute_min_mtime()
+                _file_index_ready = True
+
+        return _cleanup_result(deleted_count, deleted_size)
+
     except Exception as e:
         return {
             "success": False,
@@ -215,56 +756,148 @@ def cleanup_old_files() -> Dict[str, Any]:
         }
 
 
-@router.post("/files/cleanup")
-async def cleanup_files() -> Dict[str, Any]:
+async def run_startup_cleanup() -> None:
+    """Run the startup sweep in a worker thread and log its outcome"""
+    result = await asyncio.to_thread(cleanup_and_index_uploads)
+    if result.get("success"):
+        print(f"[FILES] {result.get('message')}")
+    else:
+        print(f"[FILES] Cleanup warning: {result.get('error')}")
+
+
+async def _cleanup_worker() -> None:
+    """Consume cleanup requests, coalescing triggers that arrive close together"""
+    last_run = 0.0
+    while True:
+        await _cleanup_queue.get()
+
+        # Triggers within CLEANUP_COALESCE_SECONDS of the last run wait for the window to
+        # close, then share one run with everything queued in the meantime
+        wait = last_run + CLEANUP_COALESCE_SECONDS - time.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        while not _cleanup_queue.empty():
+            _cleanup_queue.get_nowait()
+
+        last_run = time.time()
+        result = await _cleanup_old_files_batched()
+        if result.get("success"):
+            print(f"[FILES] {result.get('message')}")
+        else:
+            print(f"[FILES] Cleanup warning: {result.get('error')}")
+
+
+def start_cleanup_worker() -> None:
+    """Start the background cleanup worker on the running loop (called from the app lifespan)"""
+    global _cleanup_queue, _cleanup_task
+
+    if _cleanup_task is None or _cleanup_task.done():
+        _cleanup_queue = asyncio.Queue()
+        _cleanup_task = asyncio.create_task(_cleanup_worker())
+
+
+def schedule_cleanup() -> bool:
+    """Queue a cleanup run on the background worker; False if the worker isn't running"""
+    if _cleanup_task is None or _cleanup_task.done():
+        return False
+    _cleanup_queue.put_nowait(time.time())
+    return True
+
+
+async def stop_cleanup_worker() -> None:
+    """Cancel the background cleanup worker if it is running"""
+    global _cleanup_task
+
+    if _cleanup_task is not None:
+        _cleanup_task.cancel()
+        try:
+            await _cleanup_task
+        except asyncio.CancelledError:
+            pass
+        _cleanup_task = None
+
+
+@router.post("/files/cleanup", status_code=202)
+async def cleanup_files() -> JSONResponse:
     """
-    Manually trigger cleanup of old files
+    Queue a cleanup of old files on the background worker
 
     Returns:
-        Cleanup results
+        Whether the cleanup was queued (false when the worker isn't running)
     """
-    return cleanup_old_files()
+    queued = schedule_cleanup()
+    return JSONResponse(status_code=202 if queued else 503, content={"success": queued, "queued": queued})
+
+
+def _collect_stats(include_files: bool = True, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Build storage statistics from the in-memory file index"""
+    _ensure_file_index()
+    with _file_index_lock:
+        if include_files:
+            indexed = list(_file_index.items())
+            total_files = len(indexed)
+            total_size = sum(entry[0] for _, entry in indexed)
+        else:
+            # Totals only: no per-file snapshot, dicts or sorting
+            total_files = len(_file_index)
+            total_size = sum(entry[0] for entry in _file_index.values())
+
+    stats: Dict[str, Any] = {
+        "total_files": total_files,
+        "total_size_bytes": total_size,
+        "total_size_mb": round(total_size / (1024 * 1024), 2),
+        "retention_days": FILE_RETENTION_DAYS,
+    }
+
+    if include_files:
+        # Oldest first; with a limit only the oldest `limit` entries are selected
+        if limit is not None:
+            oldest = heapq.nsmallest(limit, indexed, key=lambda item: item[1][1])
+        else:
+            oldest = sorted(indexed, key=lambda item: item[1][1])
+
+        now = time.time()
+        stats["files"] = [
+            {
+                "name": name,
+                "size": size,
+                "created_at": _format_timestamp(ctime),
+                "age_days": (now - mtime) / (24 * 60 * 60)
+            }
+            for name, (size, mtime, ctime) in oldest
+        ]
+
+    return stats
 
 
 @router.get("/files/stats")
-async def get_storage_stats() -> Dict[str, Any]:
+async def get_storage_stats(include_files: bool = True, limit: Optional[int] = None) -> Dict[str, Any]:
     """
     Get storage statistics for uploaded files
 
+    Args:
+        include_files: Include the per-file listing (set false for totals only)
+        limit: Only list the `limit` oldest files
+
     Returns:
         Storage statistics
     """
     try:
-        total_files = 0
-        total_size = 0
-        files_list: List[Dict[str, Any]] = []
-
-        for file_path in UPLOAD_DIR.glob("*"):
-            if file_path.name == ".gitkeep":
-                continue
-
-            if file_path.is_file():
-                stat = file_path.stat()
-                total_files += 1
-                total_size += stat.st_size
+        if limit is not None and limit < 0:
+            raise HTTPException(status_code=400, detail="limit must be non-negative")
 
-                files_list.append({
-                    "name": file_path.name,
-                    "size": stat.st_size,
-                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    "age_days": (time.time() - stat.st_mtime) / (24 * 60 * 60)
-                })
+        # Only the cold-start index build touches the filesystem; keep that off the loop
+        if _file_index_ready:
+            stats = _collect_stats(include_files, limit)
+        else:
+            stats = await asyncio.to_thread(_collect_stats, include_files, limit)
 
         return {
             "success": True,
-            "stats": {
-                "total_files": total_files,
-                "total_size_bytes": total_size,
-                "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "retention_days": FILE_RETENTION_DAYS,
-                "files": sorted(files_list, key=lambda x: x["age_days"], reverse=True)
-            }
+            "stats": stats
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get storage stats: {str(e)}")
@@ -3,8 +3,14 @@ Nodes API endpoints - Handle all node-related operations
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Set
+from fastapi.responses import Response, StreamingResponse
+from typing import Iterator, List, Dict, Any, Optional, Set, Tuple
+import asyncio
+import inspect
+import logging
+import time
 import traceback
+from itertools import chain
 import sys
 import os
 from dotenv import load_dotenv
@@ -42,21 +48,69 @@ def safe_print(*args, **kwargs):
                     safe_args.append(repr(arg).encode('ascii', errors='replace').decode('ascii'))
         print(*safe_args, **kwargs)
 
+
+class _SafePrintHandler(logging.Handler):
+    """Logging handler that writes through safe_print so Unicode can't crash the console"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            safe_print(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 # Load environment variables
 load_dotenv()
 
+# Flow diagnostics are logged lazily: per-node DEBUG output (inputs, outputs, routing) is
+# only formatted when NODES_LOG_LEVEL enables it. Defaults to WARNING.
+logger = logging.getLogger("convoflow.nodes")
+if not logger.handlers:
+    _handler = _SafePrintHandler()
+    _handler.setFormatter(logging.Formatter("[NODES] %(message)s"))
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+
+def _log_level(name: str) -> int:
+    """Level for a NODES_LOG_LEVEL value; unknown names fall back to WARNING instead of failing"""
+    level = logging.getLevelNamesMapping().get(name.strip().upper())
+    if level is None:
+        logger.warning("Unknown NODES_LOG_LEVEL %r, using WARNING", name)
+        return logging.WARNING
+    return level
+
+
+logger.setLevel(_log_level(os.getenv("NODES_LOG_LEVEL", "WARNING")))
+
 # Add the project root to the path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 sys.path.insert(0, project_root)
 
 from nodes.node_registry import node_registry
-from nodes.base_node import is_error_output, extract_error_message
+from nodes.base_node import detect_error
+from api.v1.responses import ORJSONResponse, orjson_dumps
 from language_model_services.openai_service.openai_service import OpenAIService
 from language_model_services.groq_service.groq_service import GroqService
 from language_model_services.ollama_service.ollama_service import OllamaService
 
 router = APIRouter(prefix="/nodes", tags=["nodes"])
 
+# Lowercased node types execute_flow treats specially
+_QUERYNODE = sys.intern("querynode")
+_RESPONSENODE = sys.intern("responsenode")
+_DEBUGNODE = sys.intern("debugnode")
+
+# Cached GET /nodes/ payload, keyed on the registered node names it was built from.
+# Cleared by update_node_config.
+_SCHEMA_CACHE: Optional[Tuple[Tuple[str, ...], Dict[str, Any]]] = None
+
+# Maximum number of node schemas built in parallel worker threads
+SCHEMA_BUILD_CONCURRENCY = 8
+
+# Flow results larger than this (1 MB) are streamed as their serialized chunks
+FLOW_STREAM_THRESHOLD = 1024 * 1024
+
 
 def combine_multiple_inputs(values: List[Any]) -> Any:
     """
@@ -83,22 +137,41 @@ def combine_multiple_inputs(values: List[Any]) -> Any:
     if len(non_empty_values) == 1:
         return non_empty_values[0]
     
-    # Check if all values are strings
-    if all(isinstance(v, str) for v in non_empty_values):
+    # Classify the values in a single pass
+    all_str = all_dict = all_list = True
+    all_nonblank = True
+    for v in non_empty_values:
+        if isinstance(v, str):
+            all_dict = all_list = False
+            if all_nonblank and not v.strip():
+                all_nonblank = False
+        else:
+            all_str = False
+            if all_dict and not isinstance(v, dict):
+                all_dict = False
+            if all_list and not isinstance(v, list):
+                all_list = False
+            if not (all_dict or all_list):
+                break
+
+    if all_str:
         # Combine strings intelligently
-        if all(len(v.strip()) > 0 for v in non_empty_values):
+        if all_nonblank:
             # If all strings have content, combine them with context
             combined = "\n\n".join(non_empty_values)
             return f"Combined inputs:\n{combined}"
         else:
             # Return the longest non-empty string
             return max(non_empty_values, key=len)
-    
-    # Check if all values are dictionaries
-    if all(isinstance(v, dict) for v in non_empty_values):
+
+    if all_dict:
         # Merge dictionaries
-        combined_dict = {}
+        combined_dict: Dict[str, Any] = {}
         for i, d in enumerate(non_empty_values):
+            if not (combined_dict.keys() & d.keys()):
+                # No clashing keys: merge in one call
+                combined_dict.update(d)
+                continue
             for key, value in d.items():
                 if key in combined_dict:
                     # If key exists, combine the values
@@ -109,15 +182,11 @@ def combine_multiple_inputs(values: List[Any]) -> Any:
                 else:
                     combined_dict[key] = value
         return combined_dict
-    
-    # Check if all values are lists
-    if all(isinstance(v, list) for v in non_empty_values):
+
+    if all_list:
         # Flatten and combine lists
-        combined_list = []
-        for v in non_empty_values:
-            combined_list.extend(v)
-        return combined_list
-    
+        return list(chain.from_iterable(non_empty_values))
+
     # For mixed types, return as a structured object
     return {
         "combined_inputs": non_empty_values,
@@ -126,7 +195,107 @@ def combine_multiple_inputs(values: List[Any]) -> Any:
     }
 
 
-@router.get("/", response_model=Dict[str, Any])
+async def _build_schema_payload(node_names: List[str]) -> Dict[str, Any]:
+    """
+    Build the GET /nodes/ payload, tolerating per-node schema errors.
+
+    Schemas are built in worker threads, at most SCHEMA_BUILD_CONCURRENCY at a time.
+    """
+    semaphore = asyncio.Semaphore(SCHEMA_BUILD_CONCURRENCY)
+
+    async def build_one(node_name: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        async with semaphore:
+            try:
+                return node_name, await asyncio.to_thread(node_registry.get_node_schema, node_name), None
+            except Exception as e:
+                return node_name, None, str(e)
+
+    schemas: Dict[str, Any] = {}
+    schema_errors: Dict[str, str] = {}
+    for node_name, schema, error in await asyncio.gather(*(build_one(n) for n in node_names)):
+        if error is not None:
+            schema_errors[node_name] = error
+        elif schema:
+            schemas[node_name] = schema
+        else:
+            schema_errors[node_name] = "No schema returned"
+
+    return {
+        "success": True,
+        "data": {
+            "nodes": node_names,
+            "schemas": schemas,
+            "errors": schema_errors,
+            "total_count": len(node_names)
+        }
+    }
+
+
+def _flow_result_chunks(data: Dict[str, Any]) -> Iterator[bytes]:
+    """Serialize a run_flow result's data lazily, one response_inputs entry at a time"""
+    yield b'{"success":true,"data":{"response_inputs":{'
+    for i, (node_id, outputs) in enumerate(data["response_inputs"].items()):
+        yield (b"," if i else b"") + orjson_dumps(node_id) + b":" + orjson_dumps(outputs)
+    yield (
+        b'},"executed_nodes":' + orjson_dumps(data["executed_nodes"])
+        + b',"skipped_nodes":' + orjson_dumps(data["skipped_nodes"])
+        + b',"errors":' + orjson_dumps(data["errors"])
+        + b"}}"
+    )
+
+
+def _flow_result_response(result: Dict[str, Any]) -> Response:
+    """
+    Serialize a successful run_flow result with orjson, one response_inputs entry at a time.
+
+    Chunks are buffered until they pass FLOW_STREAM_THRESHOLD. Smaller results are sent as
+    one body; larger ones stream the buffered chunks and serialize the rest as they are sent.
+    """
+    chunks = _flow_result_chunks(result["data"])
+    buffered: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+        if size > FLOW_STREAM_THRESHOLD:
+            return StreamingResponse(chain(buffered, chunks), media_type="application/json")
+    return Response(b"".join(buffered), media_type="application/json")
+
+
+# Marker for an edge whose source socket is inactive or missing
+_INACTIVE = object()
+
+
+def _routed_value(src_payload: Dict[str, Any], src_output: str, src_node: str, node_id: str) -> Any:
+    """Value an edge carries from its upstream results, or _INACTIVE if it carries nothing"""
+    if src_output:
+        # Follow only active sockets: key must exist and be non-empty
+        if src_output not in src_payload:
+            # Requested output not present -> skip this edge entirely
+            logger.debug("ROUTING: output '%s' missing on '%s', available=%r", src_output, src_node, list(src_payload))
+            return _INACTIVE
+        value = src_payload[src_output]
+        if value in (None, "", [], {}):
+            # Inactive socket -> skip this edge
+            logger.debug("ROUTING: skipping inactive socket '%s' from '%s' -> '%s'", src_output, src_node, node_id)
+            return _INACTIVE
+        return value
+
+    # If output not specified, try to merge all outputs
+    if len(src_payload) == 1:
+        return next(iter(src_payload.values()))
+    return src_payload
+
+
+async def _run_node(loop: asyncio.AbstractEventLoop, node_instance: Any,
+                    inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Any:
+    """Run a node, awaiting coroutine nodes directly and offloading sync ones to the default executor"""
+    if inspect.iscoroutinefunction(node_instance.run):
+        return await node_instance.run(inputs, parameters)
+    return await loop.run_in_executor(None, node_instance.run, inputs, parameters)
+
+
+@router.get("/", response_class=ORJSONResponse)
 async def get_all_nodes():
     """
     Get all registered nodes with their complete schemas
@@ -136,38 +305,25 @@ async def get_all_nodes():
         - nodes: List of all registered node names
         - schemas: Dictionary mapping node names to their schemas
     """
+    global _SCHEMA_CACHE
+
     try:
         # Get all registered node names
         node_names = node_registry.list_nodes()
-        
-        # Get schemas for all nodes (tolerant to per-node errors)
-        schemas: Dict[str, Any] = {}
-        schema_errors: Dict[str, str] = {}
-        for node_name in node_names:
-            try:
-                schema = node_registry.get_node_schema(node_name)
-                if schema:
-                    schemas[node_name] = schema
-                else:
-                    schema_errors[node_name] = "No schema returned"
-            except Exception as e:
-                schema_errors[node_name] = str(e)
-        
+        key = tuple(node_names)
+
+        cached = _SCHEMA_CACHE
+        if cached is None or cached[0] != key:
+            cached = (key, await _build_schema_payload(node_names))
+            _SCHEMA_CACHE = cached
+
         # Return 200 with partial results; include per-node errors for visibility
-        return {
-            "success": True,
-            "data": {
-                "nodes": node_names,
-                "schemas": schemas,
-                "errors": schema_errors,
-                "total_count": len(node_names)
-            }
-        }
+        return ORJSONResponse(cached[1])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve nodes: {str(e)}")
 
 
-@router.get("/list", response_model=Dict[str, Any])
+@router.get("/list", response_class=ORJSONResponse)
 async def list_nodes():
     """
     Get a simple list of all registered node names
@@ -177,18 +333,18 @@ async def list_nodes():
     """
     try:
         node_names = node_registry.list_nodes()
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "nodes": node_names,
                 "total_count": len(node_names)
             }
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list nodes: {str(e)}")
 
 
-@router.get("/{node_name}", response_model=Dict[str, Any])
+@router.get("/{node_name}", response_class=ORJSONResponse)
 async def get_node_schema(node_name: str):
     """
     Get schema for a specific node
@@ -200,25 +356,35 @@ async def get_node_schema(node_name: str):
         Dict containing the node schema
     """
     try:
-        schema = node_registry.get_node_schema(node_name)
-        if not schema:
+        schema_json = node_registry.get_node_schema_json(node_name)
+        if not schema_json:
             raise HTTPException(status_code=404, detail=f"Node '{node_name}' not found")
         
-        return {
-            "success": True,
-            "data": schema
-        }
+        # Splice the node's pre-serialized schema into the envelope
+        return Response(b'{"success":true,"data":' + schema_json + b'}', media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve node schema: {str(e)}")
 
 
-@router.post("/execute", response_model=Dict[str, Any])
-async def execute_flow(payload: Dict[str, Any]):
+@router.post("/execute", response_class=ORJSONResponse)
+async def execute_flow(payload: Dict[str, Any], debug: bool = False):
     """
     Execute a node flow described as a small workflow graph.
 
+    See run_flow for the payload structure. Pass ?debug=1 to include Python tracebacks
+    in per-node exception errors.
+    """
+    result = await run_flow(payload, debug=debug)
+    return _flow_result_response(result)
+
+
+async def run_flow(payload: Dict[str, Any], debug: bool = False) -> Dict[str, Any]:
+    """
+    Execute a node flow and return the result dict (used by the /execute route and by
+    deployment invocations).
+
     Expected payload structure (example):
     {
       "nodes": {
@@ -232,6 +398,8 @@ async def execute_flow(payload: Dict[str, Any]):
         "someNode": {"someInput": "value"}
       }
     }
+
+    Pass ?debug=1 to include Python tracebacks in per-node exception errors.
     """
     try:
         nodes_cfg: Dict[str, Any] = payload.get("nodes", {})
@@ -241,13 +409,19 @@ async def execute_flow(payload: Dict[str, Any]):
         if not nodes_cfg:
             raise HTTPException(status_code=400, detail="'nodes' is required and cannot be empty")
 
+        # Lowercased node types, interned so the small type vocabulary is shared and reused
+        type_lower: Dict[str, str] = {}
+        for nid, spec in nodes_cfg.items():
+            type_lower[nid] = sys.intern((spec.get("type") or spec.get("name") or "").lower())
+
         # Enforce presence of QueryNode and ResponseNode in every workflow
-        type_values = [ (cfg.get("type") or cfg.get("name") or "").lower() for cfg in nodes_cfg.values() ]
-        print(f"DEBUG: Received node types: {type_values}")
-        has_query = any(t == "querynode" or t == "querynode".lower() or t == "querynode" for t in type_values)
-        has_response = any(t == "responsenode" or t == "responsenode".lower() or t == "responsenode" for t in type_values)
-        print(f"DEBUG: has_query={has_query}, has_response={has_response}")
+        type_set = set(type_lower.values())
+        logger.debug("Received node types: %r", type_set)
+        has_query = _QUERYNODE in type_set
+        has_response = _RESPONSENODE in type_set
+        logger.debug("has_query=%s, has_response=%s", has_query, has_response)
         if not has_query or not has_response:
+            type_values = list(type_lower.values())
             raise HTTPException(status_code=400, detail={
                 "message": "Workflow must include at least one QueryNode and one ResponseNode",
                 "received_types": type_values,
@@ -256,11 +430,13 @@ async def execute_flow(payload: Dict[str, Any]):
             })
 
         # Build adjacency and dependency maps
-        incoming_by_node: Dict[str, List[Dict[str, str]]] = {nid: [] for nid in nodes_cfg.keys()}
-        outgoing_by_node: Dict[str, List[Dict[str, str]]] = {nid: [] for nid in nodes_cfg.keys()}
-        depends_on: Dict[str, Set[str]] = {nid: set() for nid in nodes_cfg.keys()}
+        # Incoming edges per node, grouped by destination input: node -> input -> [(src_node, src_output)]
+        incoming_by_node: Dict[str, Dict[str, List[Tuple[str, str]]]] = {nid: {} for nid in nodes_cfg}
+        # Distinct downstream nodes per node, and the number of distinct upstream nodes per node
+        outgoing_by_node: Dict[str, Set[str]] = {nid: set() for nid in nodes_cfg}
+        indegree: Dict[str, int] = dict.fromkeys(nodes_cfg, 0)
 
-        print(f"DEBUG: Building edge maps for {len(edges)} edges")
+        logger.debug("Building edge maps for %d edges", len(edges))
         for edge in edges:
             src = edge.get("from", {})
             dst = edge.get("to", {})
@@ -270,44 +446,36 @@ async def execute_flow(payload: Dict[str, Any]):
                 raise HTTPException(status_code=400, detail="Each edge must include 'from.node' and 'to.node'")
             if src_node not in nodes_cfg or dst_node not in nodes_cfg:
                 raise HTTPException(status_code=400, detail=f"Edge references unknown nodes: {src_node} -> {dst_node}")
-            incoming_by_node[dst_node].append({"from": src_node, "output": src.get("output", ""), "input": dst.get("input", "")})
-            outgoing_by_node[src_node].append({"to": dst_node, "output": src.get("output", ""), "input": dst.get("input", "")})
-            depends_on[dst_node].add(src_node)
-
-        # Helper to instantiate node by type
-        def create_node_instance(type_name: str):
-            # Allow both class name and registry key (case-insensitive)
-            instance = node_registry.create_node(type_name)
-            if instance is None:
-                # Try lowercased typename as key
-                instance = node_registry.create_node(type_name.lower())
-            return instance
+            src_output = src.get("output", "")
+            input_key = dst.get("input", "") or src_output or "default"
+            incoming_by_node[dst_node].setdefault(input_key, []).append((src_node, src_output))
+            downstream = outgoing_by_node[src_node]
+            if dst_node not in downstream:
+                downstream.add(dst_node)
+                indegree[dst_node] += 1
+
+        # Instantiate every node once; validation, error reporting and execution share these.
+        # None marks a missing or unknown type, reported when the node is reached.
+        # Registry keys are lowercase, so one lookup by the lowered type covers class names too.
+        instances: Dict[str, Any] = {
+            node_id: node_registry.create_node(tl) if tl else None
+            for node_id, tl in type_lower.items()
+        }
 
         # Pre-execution credential validation: Check all required credentials before starting execution
         missing_credentials: Dict[str, List[str]] = {}  # node_id -> list of missing credential names
         for node_id, node_spec in nodes_cfg.items():
-            type_name = node_spec.get("type") or node_spec.get("name")
-            if not type_name:
-                continue  # Will be caught later
-            
-            node_instance = create_node_instance(type_name)
+            node_instance = instances[node_id]
             if node_instance is None:
                 continue  # Will be caught later
             
             # Get node parameters to determine which credentials are needed
             node_parameters = node_spec.get("parameters", {})
             
-            # Get required credentials for this node (pass parameters for dynamic credential checking)
-            required_creds = node_instance._define_required_credentials(node_parameters)
-            if required_creds:
-                missing_for_node = []
-                for cred_name in required_creds:
-                    cred_value = os.getenv(cred_name)
-                    if not cred_value or cred_value.strip() == "":
-                        missing_for_node.append(cred_name)
-                
-                if missing_for_node:
-                    missing_credentials[node_id] = missing_for_node
+            # Check required credentials for this node (pass parameters for dynamic credential checking)
+            missing_for_node = node_instance.missing_credentials(node_parameters)
+            if missing_for_node:
+                missing_credentials[node_id] = list(missing_for_node)
         
         # If any credentials are missing, return error before execution
         if missing_credentials:
@@ -315,15 +483,12 @@ async def execute_flow(payload: Dict[str, Any]):
             node_info = {}  # Store node display info for frontend
             
             for node_id, missing_creds in missing_credentials.items():
-                node_type = nodes_cfg[node_id].get("type") or nodes_cfg[node_id].get("name", "Unknown")
-                
-                # Get node display name from schema if available
-                node_instance = create_node_instance(node_type)
-                node_display_name = node_type
-                if node_instance:
-                    schema = node_instance.get_schema()
-                    node_display_name = schema.get("name", node_type)
-                
+                node_spec = nodes_cfg[node_id]
+                node_type = node_spec.get("type") or node_spec.get("name", "Unknown")
+
+                # Display name is the node class name, as reported in its schema's "name"
+                node_display_name = type(instances[node_id]).__name__
+
                 creds_str = ", ".join(missing_creds)
                 error_messages.append(f"Node '{node_id}' ({node_display_name}): Missing {creds_str}")
                 
@@ -340,10 +505,11 @@ async def execute_flow(payload: Dict[str, Any]):
                 all_missing_creds.update(creds_list)
             
             # Log the error to console for debugging
-            safe_print(f"\n❌ CREDENTIAL ERROR - Cannot execute workflow:")
-            for error_msg in error_messages:
-                safe_print(f"  - {error_msg}")
-            safe_print(f"  💡 Go to Settings > Credentials to add: {', '.join(sorted(all_missing_creds))}\n")
+            logger.warning(
+                "❌ CREDENTIAL ERROR - Cannot execute workflow:\n%s\n  💡 Go to Settings > Credentials to add: %s",
+                "\n".join(f"  - {error_msg}" for error_msg in error_messages),
+                ", ".join(sorted(all_missing_creds))
+            )
             
             error_detail = {
                 "message": f"Missing required credentials for workflow execution. Please set the following credentials in Settings > Credentials: {', '.join(sorted(all_missing_creds))}",
@@ -361,99 +527,63 @@ async def execute_flow(payload: Dict[str, Any]):
         skipped: Set[str] = set()
         response_node_inputs: Dict[str, Dict[str, Any]] = {}
 
-        # Execution loop: process nodes whose dependencies are satisfied
-        remaining_nodes = set(nodes_cfg.keys())
-        max_iterations = len(remaining_nodes) + 10  # safety
-        iterations = 0
-
-        while remaining_nodes and iterations < max_iterations:
-            iterations += 1
-            progressed = False
-
-            ready_nodes = [nid for nid in list(remaining_nodes) if depends_on[nid].issubset(executed)]
-            for node_id in ready_nodes:
+        # Kahn topological order, processed one level at a time: a node becomes ready once all
+        # of its upstream nodes have executed successfully. Nodes that error or are skipped
+        # don't release their dependents.
+        level = [nid for nid, degree in indegree.items() if degree == 0]
+        processed: Set[str] = set()
+        loop = asyncio.get_running_loop()
+
+        while level:
+            runnable: List[Tuple[str, str, Any, Dict[str, Any], Dict[str, Any]]] = []
+            for node_id in level:
+                processed.add(node_id)
                 node_spec = nodes_cfg[node_id]
                 type_name = node_spec.get("type") or node_spec.get("name")
                 if not type_name:
                     errors[node_id] = "Missing 'type' for node"
-                    remaining_nodes.remove(node_id)
-                    progressed = True
                     continue
 
-                node_instance = create_node_instance(type_name)
+                node_instance = instances[node_id]
                 if node_instance is None:
                     errors[node_id] = f"Unknown node type '{type_name}'"
-                    remaining_nodes.remove(node_id)
-                    progressed = True
                     continue
 
                 # Build inputs from external inputs and upstream edges
                 built_inputs: Dict[str, Any] = {}
                 built_inputs.update(external_inputs.get(node_id, {}))
 
-                # Group incoming connections by input name to handle multiple connections
-                input_groups = {}
-                incoming_list = incoming_by_node.get(node_id, [])
-                print(f"\nEXECUTE -> Node '{node_id}' type='{type_name}'")
-                print(f"INCOMING -> {incoming_list}")
-                for inc in incoming_list:
-                    src_node = inc["from"]
-                    src_output = inc.get("output")
-                    dst_input = inc.get("input")
-
-                    if src_node not in results:
-                        errors[node_id] = f"Upstream node '{src_node}' has no results"
-                        safe_print(f"ERROR: {errors[node_id]}")
-                        break
-                    
-                    src_payload = results[src_node]
-                    input_key = dst_input or src_output or "default"
-                    
-                    if src_output:
-                        # Follow only active sockets: key must exist and be non-empty
-                        if src_output in src_payload:
-                            candidate = src_payload[src_output]
-                            if candidate in (None, "", [], {}):
-                                # Inactive socket -> skip this edge
-                                print(f"ROUTING: skipping inactive socket '{src_output}' from '{src_node}' -> '{node_id}'")
-                                continue
-                            value = candidate
-                        else:
-                            # Requested output not present -> skip this edge entirely
-                            print(f"ROUTING: output '{src_output}' missing on '{src_node}', available={list(src_payload.keys())}")
-                            continue
-                    else:
-                        # If output not specified, try to merge all outputs
-                        if len(src_payload) == 1:
-                            value = list(src_payload.values())[0]
-                        else:
-                            value = src_payload
-                    
-                    # Group values by input key
-                    if input_key not in input_groups:
-                        input_groups[input_key] = []
-                    input_groups[input_key].append(value)
-
-                # Combine multiple values for each input
-                for input_key, values in input_groups.items():
+                # Incoming edges are already grouped by input name. Every upstream node has
+                # executed (that's what made this one ready), so its results are present.
+                incoming = incoming_by_node[node_id]
+                logger.debug("EXECUTE -> Node '%s' type='%s'", node_id, type_name)
+                logger.debug("INCOMING -> %r", incoming)
+                for input_key, sources in incoming.items():
+                    if len(sources) == 1:
+                        # Single connection - use its value as-is
+                        src_node, src_output = sources[0]
+                        value = _routed_value(results[src_node], src_output, src_node, node_id)
+                        if value is not _INACTIVE:
+                            built_inputs[input_key] = value
+                        continue
+
+                    # Multiple connections - combine the active ones intelligently
+                    values = [
+                        value for value in (
+                            _routed_value(results[src_node], src_output, src_node, node_id)
+                            for src_node, src_output in sources
+                        )
+                        if value is not _INACTIVE
+                    ]
                     if len(values) == 1:
-                        # Single value - use as-is
                         built_inputs[input_key] = values[0]
-                    else:
-                        # Multiple values - combine intelligently
+                    elif values:
                         built_inputs[input_key] = combine_multiple_inputs(values)
 
                 # If this node had incoming edges but no active routed inputs, skip silently
-                if incoming_list and (not built_inputs):
-                    print(f"SKIP: Node '{node_id}' has no active inputs after routing. Skipping execution.")
+                if incoming and (not built_inputs):
+                    logger.debug("SKIP: Node '%s' has no active inputs after routing. Skipping execution.", node_id)
                     skipped.add(node_id)
-                    remaining_nodes.remove(node_id)
-                    progressed = True
-                    continue
-
-                if node_id in errors:
-                    remaining_nodes.remove(node_id)
-                    progressed = True
                     continue
 
                 parameters: Dict[str, Any] = node_spec.get("parameters", {})
@@ -462,62 +592,68 @@ async def execute_flow(payload: Dict[str, Any]):
                 validation_error = node_instance.validate_before_execution(built_inputs, parameters)
                 if validation_error:
                     errors[node_id] = validation_error
-                    safe_print(f"\n❌ VALIDATION ERROR for node '{node_id}' (type: {type_name}):")
-                    safe_print(f"   {validation_error}\n")
-                    remaining_nodes.remove(node_id)
-                    progressed = True
+                    logger.warning("❌ VALIDATION ERROR for node '%s' (type: %s): %s", node_id, type_name, validation_error)
                     continue
 
-                try:
-                    safe_print(f"INPUTS -> {built_inputs}")
-                    safe_print(f"PARAMS -> {parameters}")
-                    output = node_instance.run(built_inputs, parameters)
-                    results[node_id] = output if isinstance(output, dict) else {"result": output}
-
-                    # Also capture node_data if it was set during execution (for DebugNode, etc.)
-                    if hasattr(node_instance, 'node_data') and node_instance.node_data:
-                        results[node_id]['__node_data__'] = node_instance.node_data
-
-                    # Safe print that handles Unicode encoding issues
-                    outputs_str = str(results[node_id])
-                    safe_print(f"OUTPUTS <- {outputs_str}")
-                    
-                    executed.add(node_id)
-                except Exception as e:
-                    tb = traceback.format_exc()
-                    errors[node_id] = f"{e}\n{tb}"
-                    safe_print(f"EXCEPTION in node '{node_id}' type='{type_name}': {errors[node_id]}")
-
-                remaining_nodes.remove(node_id)
-                progressed = True
-
-                # Capture inputs and outputs for ResponseNode(s) and DebugNode(s) (for API output)
-                tn = (type_name or "").lower()
-                if tn == "responsenode":
-                    # Include outputs for ResponseNode (final_response) and __node_data__ if present
-                    response_node_inputs[node_id] = {
-                        **results[node_id]  # Outputs produced (final_response) + __node_data__ if present
-                    }
-                    # Explicitly ensure __node_data__ is present if it exists (for consistency)
-                    if '__node_data__' in results[node_id]:
-                        response_node_inputs[node_id]['__node_data__'] = results[node_id]['__node_data__']
-                elif tn == "debugnode":
-                    # Include debug info from DebugNode
-                    # Make sure __node_data__ is included in the response
-                    response_node_inputs[node_id] = {
-                        **results[node_id]  # Outputs produced (output_data, debug_info) + __node_data__
-                    }
-                    # Explicitly ensure __node_data__ is present if it exists
-                    if '__node_data__' in results[node_id]:
-                        response_node_inputs[node_id]['__node_data__'] = results[node_id]['__node_data__']
-
-            if not progressed:
-                # Cycle or unresolved dependency
-                unresolved = list(remaining_nodes)
-                raise HTTPException(status_code=400, detail={
-                    "message": "Unresolved dependencies or cyclic graph",
-                    "unresolved_nodes": unresolved
-                })
+                logger.debug("INPUTS -> %r", built_inputs)
+                logger.debug("PARAMS -> %r", parameters)
+                runnable.append((node_id, type_name, node_instance, built_inputs, parameters))
+
+            # Nodes in the same level don't depend on each other, so run them concurrently
+            # and keep blocking node work (LLM calls, HTTP requests) off the event loop
+            outputs = await asyncio.gather(
+                *(_run_node(loop, node_instance, built_inputs, parameters)
+                  for _, _, node_instance, built_inputs, parameters in runnable),
+                return_exceptions=True
+            )
+
+            next_level: List[str] = []
+            for (node_id, type_name, node_instance, _, _), output in zip(runnable, outputs):
+                if isinstance(output, BaseException):
+                    if not isinstance(output, Exception):
+                        raise output
+                    # The response only carries a traceback on request (?debug=1); the log
+                    # records one below, which logging formats only when DEBUG is enabled
+                    if debug:
+                        tb = "".join(traceback.format_exception(output))
+                        errors[node_id] = f"{output}\n{tb}"
+                    else:
+                        errors[node_id] = str(output)
+                    logger.warning("EXCEPTION in node '%s' type='%s': %s", node_id, type_name, output)
+                    logger.debug("node %s failed", node_id, exc_info=output)
+                    continue
+
+                results[node_id] = output if isinstance(output, dict) else {"result": output}
+
+                # Also capture node_data if it was set during execution (for DebugNode, etc.)
+                if hasattr(node_instance, 'node_data') and node_instance.node_data:
+                    results[node_id]['__node_data__'] = node_instance.node_data
+
+                logger.debug("OUTPUTS <- %r", results[node_id])
+
+                executed.add(node_id)
+
+                # Capture outputs (plus __node_data__ if present) of ResponseNode(s) and DebugNode(s)
+                # for the API output. type_lower values are interned, so identity checks suffice.
+                tn = type_lower[node_id]
+                if tn is _RESPONSENODE or tn is _DEBUGNODE:
+                    response_node_inputs[node_id] = {**results[node_id]}
+
+                # Release downstream nodes now that this one has results
+                for downstream in outgoing_by_node[node_id]:
+                    indegree[downstream] -= 1
+                    if indegree[downstream] == 0:
+                        next_level.append(downstream)
+
+            level = next_level
+
+        if len(processed) != len(nodes_cfg):
+            # Cycle or unresolved dependency
+            unresolved = [nid for nid in nodes_cfg if nid not in processed]
+            raise HTTPException(status_code=400, detail={
+                "message": "Unresolved dependencies or cyclic graph",
+                "unresolved_nodes": unresolved
+            })
 
         # Check for errors in all node outputs (not just exceptions)
         # Use the error detection helper to catch errors in all formats
@@ -525,19 +661,17 @@ async def execute_flow(payload: Dict[str, Any]):
             if node_id not in errors:  # Don't override exception errors
                 if isinstance(node_output, dict):
                     # Use helper function to detect errors
-                    if is_error_output(node_output):
-                        error_msg = extract_error_message(node_output)
-                        if error_msg:
-                            errors[node_id] = error_msg
-                        else:
-                            errors[node_id] = "Node execution failed"
+                    error_msg = detect_error(node_output)
+                    if error_msg is not None:
+                        errors[node_id] = error_msg or "Node execution failed"
         
         # If there are errors, log them and return error response
         if errors:
-            safe_print(f"\n❌ WORKFLOW EXECUTION FAILED with {len(errors)} error(s):")
-            for node_id, error_msg in errors.items():
-                safe_print(f"  - Node '{node_id}': {error_msg}")
-            safe_print("")
+            logger.warning(
+                "❌ WORKFLOW EXECUTION FAILED with %d error(s):\n%s",
+                len(errors),
+                "\n".join(f"  - Node '{node_id}': {error_msg}" for node_id, error_msg in errors.items())
+            )
             
             # Return error response with 400 status
             error_response = {
@@ -550,15 +684,14 @@ async def execute_flow(payload: Dict[str, Any]):
             raise HTTPException(status_code=400, detail=error_response)
         
         # Minimal response: only what ResponseNode(s) and DebugNode(s) produced
-        safe_print("FLOW RESULT -> Terminal node outputs:")
-        safe_print(response_node_inputs)
+        logger.debug("FLOW RESULT -> Terminal node outputs: %r", response_node_inputs)
         return {
             "success": True,
             "data": {
                 "response_inputs": response_node_inputs,
                 "executed_nodes": list(executed),
                 "skipped_nodes": list(skipped),
-                "errors": errors
+                "errors": errors,
             }
         }
 
@@ -568,7 +701,46 @@ async def execute_flow(payload: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Failed to execute flow: {str(e)}")
 
 
-@router.get("/models/{service}", response_model=Dict[str, Any])
+# Language model services by name; instances are created on first use and reused
+_SERVICE_CLASSES = {
+    "openai": OpenAIService,
+    "groq": GroqService,
+    "ollama": OllamaService,
+}
+
+# Environment variables each service reads when it is created. Cached instances and model
+# lists are keyed on their current values, so keys added or rotated at runtime take effect.
+_SERVICE_ENV_VARS = {
+    "openai": ("OPENAI_API_KEY",),
+    "groq": ("GROQ_API_KEY",),
+    "ollama": ("OLLAMA_BASE_URL",),
+}
+
+# How long a service's model list is served from memory
+MODELS_CACHE_TTL_SECONDS = 300
+_models_cache: Dict[str, Tuple[Tuple[Optional[str], ...], float, Dict[str, Any]]] = {}
+_services: Dict[str, Tuple[Tuple[Optional[str], ...], Any]] = {}
+
+
+def _service_credentials(service_name: str) -> Tuple[Optional[str], ...]:
+    return tuple(os.getenv(name) for name in _SERVICE_ENV_VARS[service_name])
+
+
+def _get_service(service_name: str, credentials: Tuple[Optional[str], ...]) -> Any:
+    """Service instance for the given credentials, recreated when they change"""
+    cached = _services.get(service_name)
+    if cached and cached[0] == credentials:
+        return cached[1]
+    service = _SERVICE_CLASSES[service_name]()
+    _services[service_name] = (credentials, service)
+    return service
+
+
+def _is_error_result(models_data: Any) -> bool:
+    return not isinstance(models_data, dict) or "error" in models_data or models_data.get("success") is False
+
+
+@router.get("/models/{service}", response_class=ORJSONResponse)
 async def get_service_models(service: str):
     """
     Get available models for a specific AI service
@@ -581,29 +753,34 @@ async def get_service_models(service: str):
     """
     try:
         service_lower = service.lower()
-        
-        if service_lower == "openai":
-            service_instance = OpenAIService()
-        elif service_lower == "groq":
-            service_instance = GroqService()
-        elif service_lower == "ollama":
-            service_instance = OllamaService()
-        else:
+        if service_lower not in _SERVICE_CLASSES:
             raise HTTPException(status_code=400, detail=f"Unknown service: {service}. Supported services: openai, groq, ollama")
-        
-        models_data = service_instance.get_models()
-        
-        return {
+
+        credentials = _service_credentials(service_lower)
+        cached = _models_cache.get(service_lower)
+        if cached and cached[0] == credentials and cached[1] > time.monotonic():
+            models_data = cached[2]
+        else:
+            models_data = _get_service(service_lower, credentials).get_models()
+            # Failures are never cached, so the next request tries again
+            if _is_error_result(models_data):
+                _models_cache.pop(service_lower, None)
+            else:
+                _models_cache[service_lower] = (
+                    credentials, time.monotonic() + MODELS_CACHE_TTL_SECONDS, models_data
+                )
+
+        return ORJSONResponse({
             "success": True,
             "data": models_data
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get models for service {service}: {str(e)}")
 
 
-@router.post("/{node_id}/update-config", response_model=Dict[str, Any])
+@router.post("/{node_id}/update-config", response_class=ORJSONResponse)
 async def update_node_config(node_id: str, config: Dict[str, Any]):
     """
     Update node configuration and return updated schema
@@ -618,6 +795,8 @@ async def update_node_config(node_id: str, config: Dict[str, Any]):
     Returns:
         Updated node schema with new outputs/inputs
     """
+    global _SCHEMA_CACHE
+
     try:
         # Create node instance
         node = node_registry.create_node(node_id)
@@ -626,17 +805,24 @@ async def update_node_config(node_id: str, config: Dict[str, Any]):
         
         
         # Update other parameters if needed
+        updated = False
         for param_name, param_value in config.items():
             if hasattr(node, f'update_{param_name}'):
                 getattr(node, f'update_{param_name}')(param_value)
+                updated = True
+        if updated:
+            node.invalidate_schema()
         
         # Get updated schema
         updated_schema = node.get_schema()
+
+        # Config changes can alter schemas; rebuild the GET /nodes/ payload next time
+        _SCHEMA_CACHE = None
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": updated_schema
-        }
+        })
         
     except HTTPException:
         raise
@@ -644,7 +830,7 @@ async def update_node_config(node_id: str, config: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Failed to update node config: {str(e)}")
 
 
-@router.get("/{node_id}/schema", response_model=Dict[str, Any])
+@router.get("/{node_id}/schema", response_class=ORJSONResponse)
 async def get_node_schema(node_id: str):
     """
     Get the current schema for a specific node
@@ -662,10 +848,10 @@ async def get_node_schema(node_id: str):
         
         schema = node.get_schema()
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": schema
-        }
+        })
         
     except HTTPException:
         raise
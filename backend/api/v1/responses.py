@@ -0,0 +1,31 @@
+"""
+Shared response classes for API v1 endpoints
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Serialize content with the same orjson options ORJSONResponse uses"""
+    return orjson.dumps(
+        content,
+        default=jsonable_encoder,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized in one pass by orjson.
+
+    Returning this directly from a route skips FastAPI's jsonable_encoder walk over the
+    payload. Values orjson can't handle natively (sets, Pydantic models, ...) fall back
+    to jsonable_encoder one object at a time.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 
 from db import get_connection, USING_POSTGRES
+from api.v1.workflows import invalidate_workflow_list, summarize_graph
 
 router = APIRouter(prefix="/templates", tags=["templates"])
 
@@ -152,15 +153,17 @@ async def create_workflow_from_template(category: str, workflow_name: str = None
     # Create the workflow
     try:
         workflow_id = str(uuid.uuid4())
+        node_types_json, node_count = summarize_graph(workflow_data)
         with get_connection() as conn:
             query = (
-                "INSERT INTO workflows (id, name, data_json) VALUES (%s, %s, %s)"
+                "INSERT INTO workflows (id, name, data_json, node_types_json, node_count) VALUES (%s, %s, %s, %s, %s)"
                 if USING_POSTGRES
-                else "INSERT INTO workflows (id, name, data_json) VALUES (?, ?, ?)"
+                else "INSERT INTO workflows (id, name, data_json, node_types_json, node_count) VALUES (?, ?, ?, ?, ?)"
             )
-            conn.execute(query, (workflow_id, name, json.dumps(workflow_data)))
+            conn.execute(query, (workflow_id, name, json.dumps(workflow_data), node_types_json, node_count))
             if not USING_POSTGRES:
                 conn.commit()
+        invalidate_workflow_list()
 
         return {
             "id": workflow_id,
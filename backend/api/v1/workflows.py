@@ -2,205 +2,525 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import re
+import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
-from db import USING_POSTGRES, get_connection, list_columns
+from api.v1.responses import ORJSONResponse, orjson_dumps
+from db import INTEGRITY_ERRORS, USING_POSTGRES, get_connection, list_columns
 
+try:  # Optional dependency - only needed when using Postgres
+    from psycopg.types.json import Jsonb
+except ImportError:  # pragma: no cover - psycopg is optional at runtime
+    Jsonb = None  # type: ignore
 
-router = APIRouter(prefix="/workflows", tags=["workflows"])
 
+router = APIRouter(prefix="/workflows", tags=["workflows"])
 
-def init_db() -> None:
-    """Initialize workflows table. Called on app startup."""
+# Inline SVG icon embedded in a node's html_template
+_SVG_RE = re.compile(r"<svg[^>]*>.*?</svg>", re.IGNORECASE | re.DOTALL)
+
+# Encoded list_workflows response, reused until a workflow or deployment changes.
+# The TTL bounds staleness from writes made by other worker processes.
+LIST_CACHE_TTL_SECONDS = 10
+_list_version = 0
+_list_cache: Optional[Tuple[int, float, bytes, str]] = None  # (version, expires_at, body, etag)
+
+# Numbered 'Untitled <n>' names are unique (idx_workflows_untitled_unique). A generated name
+# that a concurrent save took first is picked again, up to this many attempts.
+UNTITLED_NAME_ATTEMPTS = 5
+
+if USING_POSTGRES:
+    _NUMBERED_UNTITLED = "name ~ '^Untitled [0-9]+$'"
+else:
+    _NUMBERED_UNTITLED = "name GLOB 'Untitled [0-9]*' AND substr(name, 10) NOT GLOB '*[^0-9]*'"
+
+
+def invalidate_workflow_list() -> None:
+    """Drop the cached workflow list. Call after changing workflows or deployments."""
+    global _list_version, _list_cache
+    _list_version += 1
+    _list_cache = None
+
+
+def _create_table(conn) -> None:
+    if USING_POSTGRES:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workflows (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                data_json JSONB NOT NULL,
+                created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                node_types_json TEXT,
+                node_count INTEGER
+            )
+            """
+        )
+    else:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workflows (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                created_at TEXT DEFAULT (datetime('now')),
+                node_types_json TEXT,
+                node_count INTEGER
+            )
+            """
+        )
+
+
+def _migrate_jsonb(conn) -> None:
+    """Migrate graphs stored as TEXT by older versions to JSONB (Postgres)."""
+    column = conn.execute(
+        """
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'workflows' AND column_name = 'data_json'
+          AND table_schema = current_schema()
+        """
+    ).fetchone()
+    if column and column["data_type"] != "jsonb":
+        conn.execute(
+            "ALTER TABLE workflows ALTER COLUMN data_json TYPE JSONB USING data_json::jsonb"
+        )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflows_data_gin
+        ON workflows USING GIN (data_json jsonb_path_ops)
+        """
+    )
+
+
+def _migrate_integer_ids(conn) -> None:
+    """Older versions used INTEGER ids; migrate those once, skip otherwise (SQLite)."""
+    id_column = conn.execute(
+        "SELECT type FROM pragma_table_info('workflows') WHERE name = 'id'"
+    ).fetchone()
+    if not id_column or id_column[0] != "INTEGER":
+        return
+    conn.execute("BEGIN TRANSACTION")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS workflows_new (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            data_json TEXT NOT NULL,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+        """
+    )
+    # Generate UUID-formatted ids inside SQLite instead of row by row in Python
+    conn.execute(
+        """
+        INSERT INTO workflows_new (id, name, data_json, created_at)
+        SELECT substr(h, 1, 8) || '-' || substr(h, 9, 4) || '-' || substr(h, 13, 4)
+               || '-' || substr(h, 17, 4) || '-' || substr(h, 21),
+               name, data_json, created_at
+        FROM (
+            SELECT lower(hex(randomblob(16))) AS h, name, data_json, created_at
+            FROM workflows
+        )
+        """
+    )
+    conn.execute("DROP TABLE workflows")
+    conn.execute("ALTER TABLE workflows_new RENAME TO workflows")
+
+
+def _add_summary_columns(conn) -> None:
+    """Add the summary columns for the list view to tables created before they existed."""
+    columns = list_columns(conn, "workflows", use_cache=False)
+    for column_name, column_type in (("node_types_json", "TEXT"), ("node_count", "INTEGER")):
+        if column_name not in columns:
+            conn.execute(f"ALTER TABLE workflows ADD COLUMN {column_name} {column_type}")
+
+
+def _create_indexes(conn) -> None:
+    """Index created_at so the list query's ORDER BY created_at DESC reads rows in index order."""
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflows_created_at
+        ON workflows (created_at DESC)
+        """
+    )
+
+
+def _create_untitled_unique_index(conn) -> None:
+    """Make numbered untitled names unique, renumbering duplicates left by older versions."""
+    rows = conn.execute(
+        f"SELECT id, name FROM workflows WHERE {_NUMBERED_UNTITLED} ORDER BY created_at, id"
+    ).fetchall()
+    next_num = max((int(row["name"][9:]) for row in rows), default=0) + 1
+    seen = set()
+    for row in rows:
+        if row["name"] in seen:
+            # Keep the oldest workflow's name; later duplicates move past the highest number
+            conn.execute(_sql("UPDATE workflows SET name = %s WHERE id = %s"), (f"Untitled {next_num}", row["id"]))
+            next_num += 1
+        seen.add(row["name"])
+    conn.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_workflows_untitled_unique
+        ON workflows (name) WHERE {_NUMBERED_UNTITLED}
+        """
+    )
+
+
+def _run_migration(step) -> None:
+    """Run one init_db step in its own transaction, so a failed step doesn't block the others."""
     try:
         with get_connection() as conn:
             if USING_POSTGRES:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS workflows (
-                        id TEXT PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        data_json TEXT NOT NULL,
-                        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
+                with conn.transaction():
+                    step(conn)
             else:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS workflows (
-                        id TEXT PRIMARY KEY,
-                        name TEXT NOT NULL,
-                        data_json TEXT NOT NULL,
-                        created_at TEXT DEFAULT (datetime('now'))
-                    )
-                    """
-                )
+                # get_connection commits the step, or rolls it back if it raised
+                step(conn)
+    except Exception as e:
+        print(f"Warning: workflows migration {step.__name__} failed: {e}")
+
 
-                columns = list_columns(conn, "workflows")
-                if columns and "id" in columns:
-                    cursor = conn.execute("PRAGMA table_info(workflows)")
-                    rows = cursor.fetchall()
-                    id_type = None
-                    for row in rows:
-                        col_name = row["name"] if isinstance(row, dict) else row[1]
-                        if col_name == "id":
-                            id_type = row["type"] if isinstance(row, dict) else row[2]
-                            break
-                    if id_type == "INTEGER":
-                        conn.execute("BEGIN TRANSACTION")
-                        try:
-                            conn.execute(
-                                """
-                                CREATE TABLE IF NOT EXISTS workflows_new (
-                                    id TEXT PRIMARY KEY,
-                                    name TEXT NOT NULL,
-                                    data_json TEXT NOT NULL,
-                                    created_at TEXT DEFAULT (datetime('now'))
-                                )
-                                """
-                            )
-                            old_rows = conn.execute(
-                                "SELECT id, name, data_json, created_at FROM workflows"
-                            ).fetchall()
-                            for row in old_rows:
-                                conn.execute(
-                                    "INSERT INTO workflows_new (id, name, data_json, created_at) VALUES (?, ?, ?, ?)",
-                                    (str(uuid.uuid4()), row[1], row[2], row[3]),
-                                )
-                            conn.execute("DROP TABLE workflows")
-                            conn.execute("ALTER TABLE workflows_new RENAME TO workflows")
-                            conn.commit()
-                        except Exception:
-                            conn.rollback()
-                            raise
+def init_db() -> None:
+    """Initialize workflows table. Called on app startup."""
+    try:
+        with get_connection() as conn:
+            _create_table(conn)
     except Exception as e:
         print(f"Warning: Failed to initialize workflows database: {e}")
         print("The database will be initialized on first use.")
+        return
+
+    _run_migration(_migrate_jsonb if USING_POSTGRES else _migrate_integer_ids)
+    _run_migration(_add_summary_columns)
+    _run_migration(_backfill_summaries)
+    _run_migration(_create_indexes)
+    _run_migration(_create_untitled_unique_index)
+
+
+def _dumps_text(data: Any) -> str:
+    return orjson.dumps(data).decode()
+
+
+def _encode_graph(data: Dict[str, Any]) -> Any:
+    """Encode a workflow graph for the data_json column (JSONB on Postgres, TEXT on SQLite)."""
+    if USING_POSTGRES:
+        return Jsonb(data, dumps=_dumps_text)
+    return _dumps_text(data)
+
+
+def _node_type(
+    node_id: Any,
+    name: Any,
+    icon: Any,
+    html_template: Any,
+    border_color: Any,
+    background_color: Any,
+) -> Dict[str, Any]:
+    """Build a node type entry for the list view, falling back to an SVG from html_template."""
+    # Handle None, empty string, or whitespace-only strings
+    if not icon or (isinstance(icon, str) and not icon.strip()):
+        icon = None
+        if html_template and isinstance(html_template, str) and "<svg" in html_template.lower():
+            svg_match = _SVG_RE.search(html_template)
+            if svg_match:
+                icon = svg_match.group(0)
+
+    return {
+        "node_id": node_id,
+        "name": name,
+        "icon": icon,
+        "icon_color": border_color or background_color,
+    }
+
+
+def summarize_graph(data: Dict[str, Any]) -> Tuple[str, int]:
+    """Return the node_types_json and node_count summary columns for a workflow graph."""
+    nodes = data.get("nodes", [])
+
+    # Extract unique node types with their details
+    unique_node_types: Dict[Any, Dict[str, Any]] = {}
+    for node in nodes:
+        if node.get("data") and node["data"].get("nodeSchema"):
+            schema = node["data"]["nodeSchema"]
+            node_id = schema.get("node_id")
+            if node_id and node_id not in unique_node_types:
+                styling = schema.get("styling", {})
+                unique_node_types[node_id] = _node_type(
+                    node_id,
+                    schema.get("name", ""),
+                    styling.get("icon"),
+                    styling.get("html_template"),
+                    styling.get("border_color"),
+                    styling.get("background_color"),
+                )
 
+    return _dumps_text(list(unique_node_types.values())), len(nodes)
 
-class WorkflowIn(BaseModel):
-    name: str = Field(default="", description="Workflow name (auto-generated if empty)")
-    data: Dict[str, Any] = Field(..., description="Workflow graph JSON")
 
+def _sql(query: str) -> str:
+    """Write a statement with %s placeholders and get it in the active backend's paramstyle."""
+    return query if USING_POSTGRES else query.replace("%s", "?")
 
-def generate_workflow_name(conn) -> str:
-    """Generate auto-increment workflow name like 'Untitled 1', 'Untitled 2', etc."""
 
-    rows = conn.execute(
-        "SELECT name FROM workflows WHERE name LIKE 'Untitled %' ORDER BY name"
-    ).fetchall()
+def _execute(conn, query: str, params: Sequence[Any] = ()):
+    """Execute one of the module's fixed statements.
 
-    existing_numbers: List[int] = []
-    for row in rows:
-        name = row["name"] if isinstance(row, dict) else row[0]
-        if name.startswith("Untitled "):
-            try:
-                existing_numbers.append(int(name.replace("Untitled ", "")))
-            except ValueError:
-                continue
+    On Postgres the statement is prepared server-side on first use so later
+    executions on the same pooled connection skip parsing and planning. SQLite
+    already reuses compiled statements through its per-connection statement cache.
+    """
+    if USING_POSTGRES:
+        return conn.execute(query, params, prepare=True)
+    return conn.execute(query, params)
 
-    next_num = 1
-    while next_num in existing_numbers:
-        next_num += 1
-    return f"Untitled {next_num}"
+
+class WorkflowIn(BaseModel):
+    name: str = Field(default="", description="Workflow name (auto-generated if empty)")
+    data: Dict[str, Any] = Field(..., description="Workflow graph JSON")
 
 
-@router.get("/", response_model=Dict[str, Any])
-async def list_workflows():
+# Workflow listing without the data_json blob; node types and counts come from the
+# summary columns written on save/update (backfilled by init_db for older rows), deployment status from a semi-join that
+# idx_deployments_workflow_active answers from the index.
+_LIST_WORKFLOWS_QUERY = """
+    SELECT w.id, w.name, w.created_at, w.node_count, w.node_types_json,
+           EXISTS (
+               SELECT 1 FROM deployments d
+               WHERE d.workflow_id = w.id AND d.is_active = 1
+           ) AS is_deployed
+    FROM workflows w ORDER BY w.created_at DESC
+"""
+
+# Node counts for rows whose summary columns have not been filled yet
+if USING_POSTGRES:
+    _UNSUMMARIZED_COUNTS_QUERY = """
+        SELECT id,
+               CASE WHEN jsonb_typeof(data_json->'nodes') = 'array'
+                    THEN jsonb_array_length(data_json->'nodes')
+               END AS node_count
+        FROM workflows WHERE node_types_json IS NULL
+    """
+else:
+    _UNSUMMARIZED_COUNTS_QUERY = """
+        SELECT id, json_array_length(data_json, '$.nodes') AS node_count
+        FROM workflows WHERE node_types_json IS NULL
+    """
+
+_STORE_SUMMARY_QUERY = _sql("UPDATE workflows SET node_types_json = %s, node_count = %s WHERE id = %s")
+
+# Next number after the highest 'Untitled <n>' name, used as a subquery of the insert.
+# The LIKE term matches the partial index on untitled names created in db_migrations.
+if USING_POSTGRES:
+    _NEXT_UNTITLED_QUERY = """
+        SELECT COALESCE(MAX(CAST(substr(name, 10) AS NUMERIC)), 0) + 1 AS next_num
+        FROM workflows
+        WHERE name LIKE 'Untitled %' AND name ~ '^Untitled [0-9]+$'
+    """
+else:
+    _NEXT_UNTITLED_QUERY = """
+        SELECT COALESCE(MAX(CAST(substr(name, 10) AS INTEGER)), 0) + 1 AS next_num
+        FROM workflows
+        WHERE name LIKE 'Untitled %' AND name GLOB 'Untitled [0-9]*'
+          AND substr(name, 10) NOT GLOB '*[^0-9]*'
+    """
+
+# The graph is read back as JSON text (not decoded JSONB) so it can be sent as-is
+_GET_WORKFLOW_QUERY = _sql(
+    "SELECT id, name, created_at, data_json{} AS data_json FROM workflows WHERE id = %s".format(
+        "::text" if USING_POSTGRES else ""
+    )
+)
+_DELETE_WORKFLOW_QUERY = _sql("DELETE FROM workflows WHERE id = %s")
+
+# Insert that falls back to the next 'Untitled <n>' name when the given name is empty,
+# saving a separate round trip. Under Postgres READ COMMITTED two concurrent untitled saves
+# can read the same MAX(); the unique index rejects the second and _insert_workflow retries.
+_INSERT_WORKFLOW_QUERY = """
+    INSERT INTO workflows (id, name, data_json, node_types_json, node_count)
+    VALUES (
+        {p},
+        COALESCE(NULLIF({p}, ''), 'Untitled ' || ({next_num})),
+        {p},
+        {p},
+        {p}
+    )
+    RETURNING name
+""".format(
+    p="%s" if USING_POSTGRES else "?",
+    # psycopg treats '%' as a placeholder marker once parameters are passed
+    next_num=_NEXT_UNTITLED_QUERY.replace(" AS next_num", "").replace("%", "%%" if USING_POSTGRES else "%"),
+)
+
+# One row per node of workflows without summary columns (rows written before they
+# existed), carrying only the schema fields the list view needs, in node
+# order. html_template is only returned when styling.icon is blank.
+if USING_POSTGRES:
+    _NODE_TYPES_QUERY = """
+        SELECT w.id AS workflow_id,
+               n.node->'data'->'nodeSchema'->>'node_id' AS node_id,
+               COALESCE(n.node->'data'->'nodeSchema'->>'name', '') AS name,
+               n.node->'data'->'nodeSchema'->'styling'->>'icon' AS icon,
+               CASE WHEN TRIM(BOTH E' \t\r\n' FROM COALESCE(n.node->'data'->'nodeSchema'->'styling'->>'icon', '')) = ''
+                    THEN n.node->'data'->'nodeSchema'->'styling'->>'html_template'
+               END AS html_template,
+               n.node->'data'->'nodeSchema'->'styling'->>'border_color' AS border_color,
+               n.node->'data'->'nodeSchema'->'styling'->>'background_color' AS background_color
+        FROM workflows w
+        CROSS JOIN LATERAL jsonb_array_elements(w.data_json->'nodes') WITH ORDINALITY AS n(node, position)
+        WHERE w.node_types_json IS NULL AND jsonb_typeof(w.data_json->'nodes') = 'array'
+        ORDER BY w.id, n.position
+    """
+else:
+    _NODE_TYPES_QUERY = """
+        SELECT w.id AS workflow_id,
+               json_extract(n.value, '$.data.nodeSchema.node_id') AS node_id,
+               COALESCE(json_extract(n.value, '$.data.nodeSchema.name'), '') AS name,
+               json_extract(n.value, '$.data.nodeSchema.styling.icon') AS icon,
+               CASE WHEN TRIM(COALESCE(json_extract(n.value, '$.data.nodeSchema.styling.icon'), ''), ' ' || char(9, 10, 13)) = ''
+                    THEN json_extract(n.value, '$.data.nodeSchema.styling.html_template')
+               END AS html_template,
+               json_extract(n.value, '$.data.nodeSchema.styling.border_color') AS border_color,
+               json_extract(n.value, '$.data.nodeSchema.styling.background_color') AS background_color
+        FROM workflows w, json_each(w.data_json, '$.nodes') n
+        WHERE w.node_types_json IS NULL AND json_type(w.data_json, '$.nodes') = 'array'
+        ORDER BY w.id, n.key
+    """
+
+
+def _fetch_workflow_list() -> List[Dict[str, Any]]:
+    """Load the workflow list with node types and deployment status (blocking)."""
+    with get_connection() as conn:
+        # Get all workflows without their graph data
+        rows = _execute(conn, _LIST_WORKFLOWS_QUERY).fetchall()
+
+    items = []
+    for row in rows:
+        workflow = dict(row)
+
+        # Build response item
+        item = {
+            "id": workflow["id"],
+            "name": workflow["name"],
+            "created_at": workflow["created_at"],
+            "node_count": workflow["node_count"] or 0,
+            "node_types": orjson.loads(workflow["node_types_json"] or "[]"),
+            "is_deployed": bool(workflow["is_deployed"]),
+        }
+
+        items.append(item)
+    return items
+
+
+def _backfill_summaries(conn) -> None:
+    """Compute and store summary columns for workflows written before they existed."""
+    node_types: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+    for node in conn.execute(_NODE_TYPES_QUERY).fetchall():
+        workflow_types = node_types.setdefault(node["workflow_id"], {})
+        node_id = node["node_id"]
+        if not node_id or node_id in workflow_types:
+            continue
+        workflow_types[node_id] = _node_type(
+            node_id,
+            node["name"],
+            node["icon"],
+            node["html_template"],
+            node["border_color"],
+            node["background_color"],
+        )
+
+    summaries = [
+        (_dumps_text(list(node_types.get(row["id"], {}).values())), row["node_count"] or 0, row["id"])
+        for row in conn.execute(_UNSUMMARIZED_COUNTS_QUERY).fetchall()
+    ]
+    if summaries:
+        conn.cursor().executemany(_STORE_SUMMARY_QUERY, summaries)
+
+
+def _fetch_workflow_body(workflow_id: str) -> Optional[bytes]:
+    """Build the get_workflow response body, or None if the workflow does not exist (blocking).
+
+    The stored graph is already JSON, so it is spliced into the body as-is instead of
+    being parsed into Python objects and encoded again.
+    """
+    with get_connection() as conn:
+        row = _execute(conn, _GET_WORKFLOW_QUERY, (workflow_id,)).fetchone()
+    if not row:
+        return None
+    item = dict(row)
+    data_json = item.pop("data_json")
+    if isinstance(data_json, str):
+        data_json = data_json.encode()
+    # Drop the closing brace of the metadata object and append the graph as "data"
+    return b'{"success":true,"data":' + orjson.dumps(item)[:-1] + b',"data":' + data_json + b"}}"
+
+
+def _insert_workflow(workflow_id: str, name: str, data: Dict[str, Any]) -> str:
+    """Insert a workflow, generating a name if none is given. Returns the name used (blocking)."""
+    workflow_name = name.strip() if name else ""
+    node_types_json, node_count = summarize_graph(data)
+    params = (workflow_id, workflow_name, _encode_graph(data), node_types_json, node_count)
+    for attempt in range(UNTITLED_NAME_ATTEMPTS):
+        try:
+            with get_connection() as conn:
+                row = _execute(conn, _INSERT_WORKFLOW_QUERY, params).fetchone()
+            return row["name"]
+        except INTEGRITY_ERRORS:
+            if workflow_name:
+                raise _name_taken(workflow_name)
+            if attempt + 1 == UNTITLED_NAME_ATTEMPTS:
+                raise
+
+
+def _name_taken(name: str) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"Workflow name '{name}' is already taken")
+
+
+def _execute_rowcount(query: str, params: Tuple[Any, ...]) -> int:
+    """Run a write statement (already in the backend's paramstyle) and return the affected row count (blocking)."""
+    with get_connection() as conn:
+        cur = _execute(conn, query, params)
+        return cur.rowcount if hasattr(cur, "rowcount") else -1
+
+
+@router.get("/", response_class=ORJSONResponse)
+async def list_workflows(request: Request):
+    global _list_cache
     try:
-        with get_connection() as conn:
-            # Get all workflows with their data
-            rows = conn.execute(
-                "SELECT id, name, data_json, created_at FROM workflows ORDER BY created_at DESC"
-            ).fetchall()
-            
-            items = []
-            for row in rows:
-                workflow = dict(row)
-                workflow_id = workflow["id"]
-                
-                # Parse workflow data
-                workflow_data = json.loads(workflow.get("data_json", "{}"))
-                nodes = workflow_data.get("nodes", [])
-                
-                # Extract unique node types with their details
-                unique_node_types = {}
-                for node in nodes:
-                    if node.get("data") and node["data"].get("nodeSchema"):
-                        schema = node["data"]["nodeSchema"]
-                        node_id = schema.get("node_id")
-                        if node_id and node_id not in unique_node_types:
-                            styling = schema.get("styling", {})
-                            
-                            # Try to get icon from styling.icon first, then from html_template
-                            icon = styling.get("icon")
-                            # Handle None, empty string, or whitespace-only strings
-                            if not icon or (isinstance(icon, str) and not icon.strip()):
-                                icon = None
-                                # Try to extract SVG from html_template if icon is not directly available
-                                html_template = styling.get("html_template")
-                                if html_template and isinstance(html_template, str):
-                                    import re
-                                    svg_match = re.search(r'<svg[^>]*>[\s\S]*?</svg>', html_template, re.IGNORECASE)
-                                    if svg_match:
-                                        icon = svg_match.group(0)
-                            
-                            unique_node_types[node_id] = {
-                                "node_id": node_id,
-                                "name": schema.get("name", ""),
-                                "icon": icon,
-                                "icon_color": styling.get("border_color") or styling.get("background_color"),
-                            }
-                
-                # Get deployment status
-                deployment = conn.execute(
-                    "SELECT is_active FROM deployments WHERE workflow_id = %s LIMIT 1"
-                    if USING_POSTGRES
-                    else "SELECT is_active FROM deployments WHERE workflow_id = ? LIMIT 1",
-                    (workflow_id,),
-                ).fetchone()
-                
-                is_deployed = False
-                if deployment:
-                    deployment_dict = dict(deployment)
-                    is_deployed = deployment_dict.get("is_active") in (True, 1, "1")
-                
-                # Build response item
-                item = {
-                    "id": workflow_id,
-                    "name": workflow["name"],
-                    "created_at": workflow["created_at"],
-                    "node_count": len(nodes),
-                    "node_types": list(unique_node_types.values()),
-                    "is_deployed": is_deployed,
-                }
-                
-                items.append(item)
-            
-        return {"success": True, "data": items}
+        cached = _list_cache
+        if cached is None or cached[0] != _list_version or cached[1] <= time.monotonic():
+            version = _list_version
+            items = await asyncio.to_thread(_fetch_workflow_list)
+            body = orjson_dumps({"success": True, "data": items})
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            cached = (version, time.monotonic() + LIST_CACHE_TTL_SECONDS, body, etag)
+            # Don't cache a list that a concurrent write may already have made stale
+            if version == _list_version:
+                _list_cache = cached
+
+        _, _, body, etag = cached
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list workflows: {e}")
 
 
-@router.get("/{workflow_id}", response_model=Dict[str, Any])
+@router.get("/{workflow_id}", response_class=ORJSONResponse)
 async def get_workflow(workflow_id: str):
     try:
-        with get_connection() as conn:
-            row = conn.execute(
-                "SELECT id, name, data_json, created_at FROM workflows WHERE id = %s",
-                (workflow_id,) if USING_POSTGRES else (workflow_id,),
-            ).fetchone()
-        if not row:
+        body = await asyncio.to_thread(_fetch_workflow_body, workflow_id)
+        if body is None:
             raise HTTPException(status_code=404, detail="Workflow not found")
-        item = dict(row)
-        item["data"] = json.loads(item.pop("data_json"))
-        return {"success": True, "data": item}
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -211,18 +531,11 @@ async def get_workflow(workflow_id: str):
 async def save_workflow(payload: WorkflowIn):
     try:
         workflow_id = str(uuid.uuid4())
-        with get_connection() as conn:
-            workflow_name = payload.name.strip() if payload.name else ""
-            if not workflow_name:
-                workflow_name = generate_workflow_name(conn)
-
-            conn.execute(
-                "INSERT INTO workflows (id, name, data_json) VALUES (%s, %s, %s)"
-                if USING_POSTGRES
-                else "INSERT INTO workflows (id, name, data_json) VALUES (?, ?, ?)",
-                (workflow_id, workflow_name, json.dumps(payload.data)),
-            )
+        workflow_name = await asyncio.to_thread(_insert_workflow, workflow_id, payload.name, payload.data)
+        invalidate_workflow_list()
         return {"success": True, "data": {"id": workflow_id, "name": workflow_name}}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save workflow: {e}")
 
@@ -235,30 +548,31 @@ class WorkflowUpdate(BaseModel):
 @router.put("/{workflow_id}", response_model=Dict[str, Any])
 async def update_workflow(workflow_id: str, payload: WorkflowUpdate):
     try:
-        with get_connection() as conn:
-            update_parts = []
-            update_values: List[Any] = []
+        update_parts = []
+        update_values: List[Any] = []
 
-            if payload.name is not None:
-                update_parts.append("name = %s" if USING_POSTGRES else "name = ?")
-                update_values.append(payload.name)
+        if payload.name is not None:
+            update_parts.append("name = %s")
+            update_values.append(payload.name)
 
-            if payload.data is not None:
-                update_parts.append("data_json = %s" if USING_POSTGRES else "data_json = ?")
-                update_values.append(json.dumps(payload.data))
+        if payload.data is not None:
+            node_types_json, node_count = summarize_graph(payload.data)
+            update_parts.append("data_json = %s, node_types_json = %s, node_count = %s")
+            update_values.extend((_encode_graph(payload.data), node_types_json, node_count))
 
-            if not update_parts:
-                raise HTTPException(status_code=400, detail="No fields to update")
+        if not update_parts:
+            raise HTTPException(status_code=400, detail="No fields to update")
 
-            update_values.append(workflow_id)
+        update_values.append(workflow_id)
 
-            query = f"UPDATE workflows SET {', '.join(update_parts)} WHERE id = %s"
-            if not USING_POSTGRES:
-                query = query.replace("%s", "?")
-
-            cur = conn.execute(query, tuple(update_values))
-            if hasattr(cur, "rowcount") and cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Workflow not found")
+        query = _sql(f"UPDATE workflows SET {', '.join(update_parts)} WHERE id = %s")
+        try:
+            rowcount = await asyncio.to_thread(_execute_rowcount, query, tuple(update_values))
+        except INTEGRITY_ERRORS:
+            raise _name_taken(payload.name or "")
+        if rowcount == 0:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        invalidate_workflow_list()
         return {"success": True, "data": {"id": workflow_id}}
     except HTTPException:
         raise
@@ -269,16 +583,14 @@ async def update_workflow(workflow_id: str, payload: WorkflowUpdate):
 @router.delete("/{workflow_id}", response_model=Dict[str, Any])
 async def delete_workflow(workflow_id: str):
     try:
-        with get_connection() as conn:
-            query = "DELETE FROM workflows WHERE id = %s"
-            if not USING_POSTGRES:
-                query = query.replace("%s", "?")
-            cur = conn.execute(query, (workflow_id,))
-            if hasattr(cur, "rowcount") and cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Workflow not found")
+        rowcount = await asyncio.to_thread(
+            _execute_rowcount, _DELETE_WORKFLOW_QUERY, (workflow_id,)
+        )
+        if rowcount == 0:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        invalidate_workflow_list()
         return {"success": True, "data": {"id": workflow_id}}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete workflow: {e}")
-
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Iterator, Optional, Sequence, Set, Dict
+from typing import Any, Iterator, List, Optional, Sequence, Set, Dict, Tuple
 
 try:  # Optional dependency - only needed when using Postgres
     import psycopg
@@ -21,8 +24,24 @@ except ImportError:  # pragma: no cover - psycopg is optional at runtime
 POSTGRES_URL = os.environ.get("POSTGRES_DB_URL_BASE")
 USING_POSTGRES = bool(POSTGRES_URL)
 
+# Constraint violations from either backend, e.g. a duplicate key in a unique index
+INTEGRITY_ERRORS: Tuple[type, ...] = (sqlite3.IntegrityError,) + (
+    (psycopg.IntegrityError,) if psycopg is not None else ()
+)
+
 # Connection pool for Postgres (initialized on first use)
 _postgres_pool: Optional["ConnectionPool"] = None
+POSTGRES_POOL_MIN_SIZE = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "1"))
+POSTGRES_POOL_MAX_SIZE = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "20"))
+
+# Idle SQLite connections for reuse. The outermost get_connection() in a thread or asyncio task
+# takes one for exclusive use; nested calls from that same owner join its transaction, so only
+# the outermost call commits and interleaving coroutines never share a transaction.
+SQLITE_POOL_MAX_IDLE = 8
+_sqlite_idle: List[sqlite3.Connection] = []
+_sqlite_lock = threading.Lock()
+_sqlite_generation = 0
+_sqlite_active: ContextVar[Optional[Tuple[Any, sqlite3.Connection]]] = ContextVar("sqlite_active", default=None)
 
 # Schema cache to avoid repeated information_schema queries
 _schema_cache: Dict[str, Set[str]] = {}
@@ -62,19 +81,25 @@ def _get_postgres_pool() -> "ConnectionPool":
             )
         
         # Create connection pool with reasonable defaults
-        # min_size: minimum connections to keep open
+        # min_size: minimum connections to keep open (small to avoid blocking on startup)
         # max_size: maximum connections allowed
         # timeout: how long to wait for a connection from the pool
+        # check: ping connections before handing them out (psycopg_pool >= 3.2)
         try:
+            pool_options = {}
+            check_connection = getattr(ConnectionPool, "check_connection", None)
+            if check_connection is not None:
+                pool_options["check"] = check_connection
             _postgres_pool = ConnectionPool(
                 POSTGRES_URL,
-                min_size=1,  # Reduced from 2 to avoid blocking on startup
-                max_size=10,
+                min_size=POSTGRES_POOL_MIN_SIZE,
+                max_size=max(POSTGRES_POOL_MAX_SIZE, POSTGRES_POOL_MIN_SIZE),
                 timeout=5.0,
                 kwargs={
                     "row_factory": dict_row,
                     "autocommit": True
-                }
+                },
+                **pool_options,
             )
         except Exception as e:
             raise RuntimeError(
@@ -86,9 +111,51 @@ def _get_postgres_pool() -> "ConnectionPool":
     return _postgres_pool
 
 
+def _open_sqlite_connection() -> sqlite3.Connection:
+    """Open a SQLite connection with the app's pragmas."""
+    # Only create data directory when actually using SQLite
+    _ensure_data_dir()
+    conn = sqlite3.connect(SQLITE_DB_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
+
+def _acquire_sqlite_connection() -> Tuple[sqlite3.Connection, int]:
+    """Take an idle SQLite connection, or open one; returns it with its pool generation."""
+    with _sqlite_lock:
+        generation = _sqlite_generation
+        if _sqlite_idle:
+            return _sqlite_idle.pop(), generation
+    return _open_sqlite_connection(), generation
+
+
+def _sqlite_owner() -> Tuple[int, Optional["asyncio.Task"]]:
+    """Identify the thread and asyncio task (if any) using a connection."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), task
+
+
+def _release_sqlite_connection(conn: sqlite3.Connection, generation: int) -> None:
+    """Return a connection to the idle pool, closing it if the pool is full or was closed."""
+    with _sqlite_lock:
+        if generation == _sqlite_generation and len(_sqlite_idle) < SQLITE_POOL_MAX_IDLE:
+            _sqlite_idle.append(conn)
+            return
+    conn.close()
+
+
 @contextmanager
 def get_connection() -> Iterator["ConnectionProtocol"]:
-    """Yield a database connection (Postgres pool if configured, otherwise SQLite)."""
+    """Yield a database connection (Postgres pool if configured, otherwise SQLite).
+
+    Rows are always addressable by column name: dict_row on Postgres, sqlite3.Row on SQLite.
+    """
 
     if USING_POSTGRES:
         # Use connection pool instead of creating new connection each time
@@ -96,14 +163,48 @@ def get_connection() -> Iterator["ConnectionProtocol"]:
         with pool.connection() as conn:
             yield conn
     else:
-        # Only create data directory when actually using SQLite
-        _ensure_data_dir()
-        conn = sqlite3.connect(SQLITE_DB_PATH)
-        conn.row_factory = sqlite3.Row
+        owner = _sqlite_owner()
+        active = _sqlite_active.get()
+        if active is not None and active[0] == owner:
+            # Nested call: join the outer transaction, which the outermost call finishes
+            yield active[1]
+            return
+
+        # Borrow a pooled connection; finish its transaction before handing it back
+        conn, generation = _acquire_sqlite_connection()
+        token = _sqlite_active.set((owner, conn))
         try:
             yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
         finally:
+            _sqlite_active.reset(token)
+            _release_sqlite_connection(conn, generation)
+
+
+def close_connections() -> None:
+    """Close the Postgres pool and the idle SQLite connections. Called on app shutdown."""
+    global _postgres_pool, _sqlite_generation
+
+    if _postgres_pool is not None:
+        _postgres_pool.close()
+        _postgres_pool = None
+
+    # Connections still in use are closed when they are released
+    with _sqlite_lock:
+        connections = list(_sqlite_idle)
+        _sqlite_idle.clear()
+        _sqlite_generation += 1
+    for conn in connections:
+        try:
             conn.close()
+        except sqlite3.Error:
+            pass
 
 
 def list_columns(conn: "ConnectionProtocol", table_name: str, use_cache: bool = True) -> Set[str]:
@@ -133,12 +234,11 @@ def list_columns(conn: "ConnectionProtocol", table_name: str, use_cache: bool =
             (table_name,),
         )
         rows = cursor.fetchall()
-        columns = {row["column_name"] if isinstance(row, dict) else row[0] for row in rows}
+        columns = {row["column_name"] for row in rows}
     else:
         cursor = conn.execute(f"PRAGMA table_info({table_name})")
         rows = cursor.fetchall()
-        # sqlite3.Row can be indexed by name or ordinal
-        columns = {row["name"] if isinstance(row, sqlite3.Row) else row[1] for row in rows}
+        columns = {row["name"] for row in rows}
     
     # Cache the result
     _schema_cache[cache_key] = columns
@@ -26,6 +26,12 @@ def create_performance_indexes() -> None:
                 ON workflows (name)
                 """
             )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_workflows_untitled_name 
+                ON workflows (name) WHERE name LIKE 'Untitled %'
+                """
+            )
             
             # Deployments table indexes
             conn.execute(
@@ -34,6 +40,13 @@ def create_performance_indexes() -> None:
                 ON deployments (workflow_id)
                 """
             )
+            # Covering index so deployment status lookups by workflow are index-only
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_deployments_workflow_active 
+                ON deployments (workflow_id) INCLUDE (is_active)
+                """
+            )
             conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_deployments_created_at 
@@ -76,12 +89,24 @@ def create_performance_indexes() -> None:
                 ON workflows (name)
                 """
             )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_workflows_untitled_name 
+                ON workflows (name) WHERE name LIKE 'Untitled %'
+                """
+            )
             conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_deployments_workflow_id 
                 ON deployments (workflow_id)
                 """
             )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_deployments_workflow_active 
+                ON deployments (workflow_id, is_active)
+                """
+            )
             conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_deployments_created_at 
@@ -3,8 +3,31 @@ Resend Email Service - Send emails using Resend API
 """
 
 import os
+import re
+import threading
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, Union
+
+# Shared keep-alive session so consecutive sends reuse the TLS connection to Resend
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Splits comma-separated recipient lists, dropping the whitespace around each address
+_ADDR_SPLIT = re.compile(r"\s*,\s*")
+
+
+def _get_session() -> requests.Session:
+    """Get or create the shared HTTP session for the Resend API"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update({"Content-Type": "application/json"})
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+                _session = session
+    return _session
 
 
 class ResendService:
@@ -18,6 +41,8 @@ class ResendService:
         """Initialize Resend service with API key from environment"""
         self.api_key = os.getenv("RESEND_API_KEY")
         self.api_url = "https://api.resend.com/emails"
+        # Use environment variable or Resend's default testing domain
+        self.default_from = os.getenv("RESEND_FROM_EMAIL", "onboarding@resend.dev")
 
         if not self.api_key:
             print("Warning: RESEND_API_KEY not found in environment variables")
@@ -30,8 +55,8 @@ class ResendService:
         text_body: Optional[str] = None,
         from_email: Optional[str] = None,
         from_name: Optional[str] = "Convo Flow",
-        cc: Optional[str] = None,
-        bcc: Optional[str] = None,
+        cc: Optional[Union[str, List[str]]] = None,
+        bcc: Optional[Union[str, List[str]]] = None,
         reply_to: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -44,8 +69,8 @@ class ResendService:
             text_body: Plain text email body (optional if html_body provided)
             from_email: Sender email (defaults to env variable or onboarding@resend.dev)
             from_name: Sender display name
-            cc: CC recipients (comma-separated)
-            bcc: BCC recipients (comma-separated)
+            cc: CC recipients (comma-separated string or list)
+            bcc: BCC recipients (comma-separated string or list)
             reply_to: Reply-to email address
 
         Returns:
@@ -82,9 +107,7 @@ class ResendService:
             }
 
         # Default from email
-        if not from_email:
-            # Use environment variable or Resend's default testing domain
-            from_email = os.getenv("RESEND_FROM_EMAIL", "onboarding@resend.dev")
+        from_email = from_email or self.default_from
 
         # Build email payload
         payload = {
@@ -101,20 +124,17 @@ class ResendService:
 
         # Add optional fields
         if cc:
-            payload["cc"] = [email.strip() for email in cc.split(",")]
+            payload["cc"] = _ADDR_SPLIT.split(cc.strip()) if isinstance(cc, str) else list(cc)
         if bcc:
-            payload["bcc"] = [email.strip() for email in bcc.split(",")]
+            payload["bcc"] = _ADDR_SPLIT.split(bcc.strip()) if isinstance(bcc, str) else list(bcc)
         if reply_to:
             payload["reply_to"] = reply_to
 
         try:
             # Send request to Resend API
-            response = requests.post(
+            response = _get_session().post(
                 self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
+                headers={"Authorization": f"Bearer {self.api_key}"},
                 json=payload,
                 timeout=30
             )
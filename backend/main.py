@@ -1,5 +1,8 @@
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -18,7 +21,14 @@ from api.v1.workflows import router as workflows_router, init_db as init_workflo
 from api.v1.vector_store import router as vector_store_router
 from api.v1.deployments import router as deployments_router, init_db as init_deployments_db
 from api.v1.templates import router as templates_router
-from api.v1.files import router as files_router
+from api.v1.files import (
+    router as files_router,
+    run_startup_cleanup,
+    start_cleanup_worker,
+    stop_cleanup_worker,
+)
+from db import close_connections
+from db_migrations import create_performance_indexes
 
 # Load environment variables
 load_dotenv()
@@ -30,25 +40,9 @@ try:
 except ImportError as e:
     print(f"Warning: Could not register nodes: {e}")
 
-# Create performance indexes on startup
-try:
-    from db_migrations import create_performance_indexes
-    create_performance_indexes()
-except Exception as e:
-    print(f"Warning: Could not create indexes: {e}")
-
-# Create FastAPI app for development
-app = FastAPI(
-    title="BotCanvas API - Development",
-    description="Development server for no-code chatbot builder API",
-    version="dev",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on application startup."""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database tables and background file maintenance around the app's lifetime."""
     print("[DB] Initializing database tables...")
     try:
         init_workflows_db()
@@ -58,17 +52,33 @@ async def startup_event():
         print(f"[DB] Warning: Database initialization failed: {e}")
         print("[DB] The application will continue, but database operations may fail.")
 
-    # Run file cleanup on startup
-    print("[FILES] Running file cleanup...")
+    # Create performance indexes once the tables they cover exist
     try:
-        from api.v1.files import cleanup_old_files
-        result = cleanup_old_files()
-        if result.get("success"):
-            print(f"[FILES] {result.get('message')}")
-        else:
-            print(f"[FILES] Cleanup warning: {result.get('error')}")
+        create_performance_indexes()
     except Exception as e:
-        print(f"[FILES] Warning: File cleanup failed: {e}")
+        print(f"Warning: Could not create indexes: {e}")
+
+    # Sweep old uploads in the background so the app starts serving immediately
+    print("[FILES] Scheduling file cleanup...")
+    startup_cleanup = asyncio.create_task(run_startup_cleanup())
+    start_cleanup_worker()
+
+    yield
+
+    if not startup_cleanup.done():
+        startup_cleanup.cancel()
+    await stop_cleanup_worker()
+    close_connections()
+
+# Create FastAPI app for development
+app = FastAPI(
+    title="BotCanvas API - Development",
+    description="Development server for no-code chatbot builder API",
+    version="dev",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
 
 # Add CORS middleware - configurable via environment variable
 # Default to allow all origins for development, restrict in production
@@ -1,52 +1,90 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, ClassVar, List, Optional, Tuple
 from dataclasses import dataclass
-import sys
+from functools import cached_property, lru_cache
 import os
+import re
+
+import orjson
 
-# Add the parent directory to the path to import ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ui_components import NodeUIConfig, UIGroup, UIComponent
 
 
+# Error detection prefixes and patterns, built once so each string is scanned in C
+_ERR_PREFIXES = ("Error:", "ERROR:", "error:")
+_ERR_WORD_RE = re.compile(r"error", re.IGNORECASE)
+_ERR_INDICATOR_RE = re.compile(r"failed|not available|not found|invalid|missing", re.IGNORECASE)
+_ERR_PHRASE_RE = re.compile(r"error:|failed to|not configured|not set|not found", re.IGNORECASE)
+_ERR_MESSAGE_RE = re.compile(r"error:|failed to|not configured|not set|not found|invalid", re.IGNORECASE)
+
+# Output fields that can carry an error message, in the order detect_error prefers them
+_ERROR_FIELDS = ("error", "status", "query", "response", "summary", "text")
+# Preference rank of each message field (lower wins)
+_ERROR_FIELD_RANK = {field: rank for rank, field in enumerate(_ERROR_FIELDS)}
+
+
 # Error detection helper functions
-def is_error_output(output: Dict[str, Any]) -> bool:
+def detect_error(output: Dict[str, Any]) -> Optional[str]:
     """
-    Check if a node output represents an error.
+    Detect an error in a node output and extract its message in a single scan.
     
     Args:
         output: Dictionary containing node output
         
     Returns:
-        True if the output represents an error, False otherwise
+        Error message string if the output represents an error, None otherwise
     """
     if not isinstance(output, dict):
-        return False
+        return None
     
-    # Check for explicit success: False flag
-    if output.get("success") is False:
-        return True
+    # metadata.error both flags the error and is the preferred message
+    metadata = output.get("metadata")
+    if metadata and isinstance(metadata, dict):
+        error_msg = metadata.get("error")
+        if error_msg:
+            return str(error_msg)
     
-    # Check for metadata.error
-    if output.get("metadata") and isinstance(output.get("metadata"), dict):
-        if output["metadata"].get("error"):
-            return True
+    # Check for explicit success: False flag
+    is_error = output.get("success") is False
+    message = None
+    message_rank = len(_ERROR_FIELDS)
     
-    # Check for error prefixes in string fields
-    error_prefixes = ["Error:", "ERROR:", "error:"]
+    # One pass over every string value: any of them can flag an error, while the message
+    # comes from the most preferred message field that reads like one
     for key, value in output.items():
-        if isinstance(value, str):
-            # Check if string starts with any error prefix
-            for prefix in error_prefixes:
-                if value.strip().startswith(prefix):
-                    return True
-            # Check if string contains error indicators
-            if "error" in value.lower() and any(indicator in value.lower() for indicator in ["failed", "not available", "not found", "invalid", "missing"]):
-                # More careful check - only flag if it's clearly an error message
-                if any(phrase in value.lower() for phrase in ["error:", "failed to", "not configured", "not set", "not found"]):
-                    return True
+        if not isinstance(value, str):
+            continue
+        rank = _ERROR_FIELD_RANK.get(key, message_rank)
+        if rank < message_rank and _ERR_MESSAGE_RE.search(value):
+            message = value
+            message_rank = rank
+        # Every error marker contains "error"; most outputs stop at that one scan
+        if not is_error and _ERR_WORD_RE.search(value):
+            # Check if string starts with any error prefix, or clearly reads as an error message
+            if value.lstrip().startswith(_ERR_PREFIXES) or \
+               (_ERR_INDICATOR_RE.search(value) and _ERR_PHRASE_RE.search(value)):
+                is_error = True
+        # Nothing can beat a message from the first preferred field
+        if is_error and message_rank == 0:
+            return message
     
-    return False
+    if not is_error:
+        return None
+    
+    # Default error message
+    return message or "An error occurred during node execution"
+
+
+def is_error_output(output: Dict[str, Any]) -> bool:
+    """
+    Check if a node output represents an error.
+    
+    Args:
+        output: Dictionary containing node output
+        
+    Returns:
+        True if the output represents an error, False otherwise
+    """
+    return detect_error(output) is not None
 
 
 def extract_error_message(output: Dict[str, Any]) -> Optional[str]:
@@ -59,32 +97,45 @@ def extract_error_message(output: Dict[str, Any]) -> Optional[str]:
     Returns:
         Error message string if error is detected, None otherwise
     """
-    if not is_error_output(output):
-        return None
-    
-    # Try metadata.error first
-    if output.get("metadata") and isinstance(output.get("metadata"), dict):
-        error_msg = output["metadata"].get("error")
-        if error_msg:
-            return str(error_msg)
-    
-    # Try common error fields
-    for field in ["error", "status", "query", "response", "summary", "text"]:
-        if field in output:
-            value = output[field]
-            if isinstance(value, str):
-                # Check if it's an error message
-                if value.strip().startswith(("Error:", "ERROR:", "error:")):
-                    return value
-                # Check for error indicators
-                if any(phrase in value.lower() for phrase in ["error:", "failed to", "not configured", "not set", "not found", "invalid"]):
-                    return value
-    
-    # Default error message
-    return "An error occurred during node execution"
+    return detect_error(output)
+
+
+def _missing_credentials(required_creds: List[str]) -> Tuple[str, ...]:
+    """Return the credentials that are unset or blank in the environment"""
+    environ = os.environ
+    return tuple(name for name in required_creds if not environ.get(name, "").strip())
+
+
+def _is_empty(value: Any) -> bool:
+    """True for None, blank strings and empty lists/dicts"""
+    if value:
+        # Only a whitespace-only string is both truthy and empty
+        return isinstance(value, str) and value.isspace()
+    # Falsy: 0 and False are real values, empty tuples/sets are kept as before
+    return value is None or isinstance(value, (str, list, dict))
+
 
+@lru_cache(maxsize=None)
+def _input_check(name: str) -> Tuple[str, str, str]:
+    """(name, missing message, empty message) for a required input"""
+    return (
+        name,
+        f"Required input '{name}' is missing. Please provide a value.",
+        f"Required input '{name}' is empty. Please provide a value.",
+    )
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _param_check(name: str) -> Tuple[str, str, str]:
+    """(name, missing message, empty message) for a required parameter"""
+    return (
+        name,
+        f"Required parameter '{name}' is missing. Please provide a value.",
+        f"Required parameter '{name}' is missing or empty. Please provide a value.",
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class NodeInput:
     """Standardized input structure for nodes"""
     name: str
@@ -94,7 +145,7 @@ class NodeInput:
     default_value: Any = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeOutput:
     """Standardized output structure for nodes"""
     name: str
@@ -102,7 +153,7 @@ class NodeOutput:
     description: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeParameter:
     """Standardized parameter structure for nodes"""
     name: str
@@ -113,7 +164,7 @@ class NodeParameter:
     options: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeStyling:
     """Styling configuration for node appearance"""
     icon: Optional[str] = None  # SVG string, emoji, or image URL
@@ -132,38 +183,64 @@ class NodeStyling:
     hide_outputs: bool = False  # If True, hide output handles in the UI (for terminal nodes)
 
 
-class BaseNode(ABC):
+# NodeStyling fields in schema order
+_STYLING_FIELDS = tuple(NodeStyling.__dataclass_fields__)
+
+# Shared styling for nodes that don't define their own (safe to share since NodeStyling is frozen)
+_DEFAULT_STYLING = NodeStyling()
+
+
+class BaseNode:
     """
     Base class for all nodes in the chatbot builder.
     Provides a standardized interface for input/output handling and execution.
+    Subclasses must implement _define_inputs, _define_outputs, _define_parameters and execute.
     """
     
+    # Schema shared by all instances of a node class (built on first get_schema call)
+    _schema_cache: ClassVar[Optional[Dict[str, Any]]] = None
+    _schema_json_cache: ClassVar[Optional[bytes]] = None
+    
     def __init__(self):
         self.node_id = self.__class__.__name__.lower()
-        self.inputs = self._define_inputs()
-        self.outputs = self._define_outputs()
-        self.parameters = self._define_parameters()
+        # Definitions are fixed once built; tuples keep them from being mutated under the cached schema
+        self.inputs = tuple(self._define_inputs())
+        self.outputs = tuple(self._define_outputs())
+        self.parameters = tuple(self._define_parameters())
         self.styling = self._define_styling()
         self.ui_config = self._define_ui_config()
+        self._set_required_checks()
+    
+    def _set_required_checks(self) -> None:
+        """Precompute the required input/parameter checks used by validation"""
+        self._required_inputs = tuple(_input_check(i.name) for i in self.inputs if i.required)
+        self._required_params = tuple(_param_check(p.name) for p in self.parameters if p.required)
+    
+    def invalidate_schema(self) -> None:
+        """
+        Call after changing this instance's node_id, inputs, outputs, parameters, styling
+        or ui_config. The instance stops using the class-wide schema and builds its own.
+        """
+        self._set_required_checks()
+        self.__dict__.pop("_styling_dict", None)
+        self.__dict__.pop("_ui_config_dict", None)
+        self._own_schema = None
     
-    @abstractmethod
     def _define_inputs(self) -> List[NodeInput]:
         """Define the input structure for this node"""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement _define_inputs")
     
-    @abstractmethod
     def _define_outputs(self) -> List[NodeOutput]:
         """Define the output structure for this node"""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement _define_outputs")
     
-    @abstractmethod
     def _define_parameters(self) -> List[NodeParameter]:
         """Define the parameters for this node"""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement _define_parameters")
     
     def _define_styling(self) -> NodeStyling:
         """Define the styling for this node - override in subclasses for custom styling"""
-        return NodeStyling()
+        return _DEFAULT_STYLING
     
     def _define_ui_config(self) -> Optional[NodeUIConfig]:
         """Define the UI configuration for this node - override in subclasses for custom UI"""
@@ -179,7 +256,6 @@ class BaseNode(ABC):
         """
         return "Other"
     
-    @abstractmethod
     def execute(self, inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute the node logic
@@ -191,7 +267,7 @@ class BaseNode(ABC):
         Returns:
             Dictionary of output values
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement execute")
     
     def _define_required_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> List[str]:
         """
@@ -206,26 +282,32 @@ class BaseNode(ABC):
         """
         return []
     
-    def validate_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    def missing_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> Tuple[str, ...]:
         """
-        Validate that all required credentials are present in environment.
+        Get the required credentials that are unset or blank in the environment.
         
         Args:
             parameters: Optional node parameters that may affect which credentials are needed
         
         Returns:
-            Error message if credentials are missing, None if all present
+            Tuple of missing environment variable names (empty if all present)
         """
         required_creds = self._define_required_credentials(parameters)
         if not required_creds:
-            return None
+            return ()
+        return _missing_credentials(required_creds)
+    
+    def validate_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Validate that all required credentials are present in environment.
         
-        missing_creds = []
-        for cred_name in required_creds:
-            cred_value = os.getenv(cred_name)
-            if not cred_value or cred_value.strip() == "":
-                missing_creds.append(cred_name)
+        Args:
+            parameters: Optional node parameters that may affect which credentials are needed
         
+        Returns:
+            Error message if credentials are missing, None if all present
+        """
+        missing_creds = self.missing_credentials(parameters)
         if missing_creds:
             creds_str = ", ".join(missing_creds)
             return f"Missing required credential(s): {creds_str}. Please set them in Settings > Credentials or environment variables."
@@ -239,16 +321,11 @@ class BaseNode(ABC):
         Returns:
             Error message if validation fails, None if passes
         """
-        for input_def in self.inputs:
-            if input_def.required:
-                if input_def.name not in inputs:
-                    return f"Required input '{input_def.name}' is missing. Please provide a value."
-                
-                value = inputs[input_def.name]
-                # Check if value is empty
-                if value is None or (isinstance(value, str) and value.strip() == "") or \
-                   (isinstance(value, (list, dict)) and len(value) == 0):
-                    return f"Required input '{input_def.name}' is empty. Please provide a value."
+        for name, missing_msg, empty_msg in self._required_inputs:
+            if name not in inputs:
+                return missing_msg
+            if _is_empty(inputs[name]):
+                return empty_msg
         
         return None
     
@@ -259,16 +336,11 @@ class BaseNode(ABC):
         Returns:
             Error message if validation fails, None if passes
         """
-        for param_def in self.parameters:
-            if param_def.required:
-                if param_def.name not in parameters:
-                    return f"Required parameter '{param_def.name}' is missing. Please provide a value."
-                
-                value = parameters[param_def.name]
-                # Check if value is empty
-                if value is None or (isinstance(value, str) and value.strip() == "") or \
-                   (isinstance(value, (list, dict)) and len(value) == 0):
-                    return f"Required parameter '{param_def.name}' is missing or empty. Please provide a value."
+        for name, missing_msg, empty_msg in self._required_params:
+            if name not in parameters:
+                return missing_msg
+            if _is_empty(parameters[name]):
+                return empty_msg
         
         return None
     
@@ -289,20 +361,119 @@ class BaseNode(ABC):
         if cred_error:
             return cred_error
         
-        # Then check required inputs
-        input_error = self.validate_inputs(inputs)
-        if input_error:
-            return input_error
+        # Then check required inputs and parameters in a single pass each
+        for name, missing_msg, empty_msg in self._required_inputs:
+            if name not in inputs:
+                return missing_msg
+            if _is_empty(inputs[name]):
+                return empty_msg
         
-        # Finally check required parameters
-        param_error = self.validate_parameters(parameters)
-        if param_error:
-            return param_error
+        for name, missing_msg, empty_msg in self._required_params:
+            if name not in parameters:
+                return missing_msg
+            if _is_empty(parameters[name]):
+                return empty_msg
         
         return None
     
     def get_schema(self) -> Dict[str, Any]:
-        """Get the complete schema for this node"""
+        """
+        Get the complete schema for this node.
+        
+        The schema is built once per class (or per instance after invalidate_schema) and
+        shared between callers, so treat it as read-only; copy it before changing it.
+        """
+        if "_own_schema" in self.__dict__:
+            if self._own_schema is None:
+                self._own_schema = self._build_schema()
+            return self._own_schema
+        
+        cls = type(self)
+        schema = cls.__dict__.get("_schema_cache")
+        if schema is None:
+            schema = self._build_schema()
+            cls._schema_cache = schema
+        return schema
+    
+    def get_schema_json(self) -> bytes:
+        """Get the schema serialized as JSON bytes (cached per class like get_schema)"""
+        if "_own_schema" in self.__dict__:
+            return orjson.dumps(self.get_schema(), option=orjson.OPT_NON_STR_KEYS)
+        
+        cls = type(self)
+        body = cls.__dict__.get("_schema_json_cache")
+        if body is None:
+            body = orjson.dumps(self.get_schema(), option=orjson.OPT_NON_STR_KEYS)
+            cls._schema_json_cache = body
+        return body
+    
+    @cached_property
+    def _styling_dict(self) -> Dict[str, Any]:
+        """Serialized styling, built once per instance"""
+        styling = self.styling
+        return {name: getattr(styling, name) for name in _STYLING_FIELDS}
+    
+    @cached_property
+    def _ui_config_dict(self) -> Optional[Dict[str, Any]]:
+        """Serialized UI config, built once per instance"""
+        ui_config = self.ui_config
+        if not ui_config:
+            return None
+        dialog = ui_config.dialog_config
+        return {
+            "node_id": ui_config.node_id,
+            "node_name": ui_config.node_name,
+            "groups": [
+                {
+                    "name": group.name,
+                    "label": group.label,
+                    "description": group.description,
+                    "components": [
+                        {
+                            "type": comp.type,
+                            "name": comp.name,
+                            "label": comp.label,
+                            "description": comp.description,
+                            "required": comp.required,
+                            "default_value": comp.default_value,
+                            "placeholder": comp.placeholder,
+                            "disabled": comp.disabled,
+                            "visible": comp.visible,
+                            "validation": comp.validation,
+                            "styling": comp.styling,
+                            # Component-specific fields
+                            **{field: getattr(comp, field) for field in comp._EXTRA_FIELDS},
+                        }
+                        for comp in group.components
+                    ],
+                    "collapsible": group.collapsible,
+                    "collapsed": group.collapsed,
+                    "styling": group.styling
+                }
+                for group in (ui_config.groups or [])
+            ],
+            "global_styling": ui_config.global_styling,
+            "layout": ui_config.layout,
+            "columns": ui_config.columns,
+            "dialog_config": {
+                "title": dialog.title,
+                "description": dialog.description,
+                "width": dialog.width,
+                "height": dialog.height,
+                "background_color": dialog.background_color,
+                "border_color": dialog.border_color,
+                "text_color": dialog.text_color,
+                "icon": dialog.icon,
+                "icon_color": dialog.icon_color,
+                "header_background": dialog.header_background,
+                "footer_background": dialog.footer_background,
+                "button_primary_color": dialog.button_primary_color,
+                "button_secondary_color": dialog.button_secondary_color,
+            } if dialog else None
+        }
+    
+    def _build_schema(self) -> Dict[str, Any]:
+        """Build the schema dict from this instance's definitions"""
         return {
             "node_id": self.node_id,
             "name": self.__class__.__name__,
@@ -337,81 +508,8 @@ class BaseNode(ABC):
                 }
                 for param in self.parameters
             ],
-            "styling": {
-                "icon": self.styling.icon,
-                "background_color": self.styling.background_color,
-                "border_color": self.styling.border_color,
-                "text_color": self.styling.text_color,
-                "custom_css": self.styling.custom_css,
-                "subtitle": self.styling.subtitle,
-                "icon_position": self.styling.icon_position,
-                "shape": self.styling.shape,
-                "width": self.styling.width,
-                "height": self.styling.height,
-                "html_template": self.styling.html_template,
-                "css_classes": self.styling.css_classes,
-                "inline_styles": self.styling.inline_styles,
-                "hide_outputs": self.styling.hide_outputs
-            },
-            "ui_config": {
-                "node_id": self.ui_config.node_id,
-                "node_name": self.ui_config.node_name,
-                "groups": [
-                    {
-                        "name": group.name,
-                        "label": group.label,
-                        "description": group.description,
-                        "components": [
-                            {
-                                "type": comp.type,
-                                "name": comp.name,
-                                "label": comp.label,
-                                "description": comp.description,
-                                "required": comp.required,
-                                "default_value": comp.default_value,
-                                "placeholder": comp.placeholder,
-                                "disabled": comp.disabled,
-                                "visible": comp.visible,
-                                "validation": comp.validation,
-                                "styling": comp.styling,
-                                # Component-specific fields
-                                **({"rows": comp.rows} if hasattr(comp, 'rows') else {}),
-                                **({"options": comp.options} if hasattr(comp, 'options') else {}),
-                                **({"multiple": comp.multiple} if hasattr(comp, 'multiple') else {}),
-                                **({"text": comp.text} if hasattr(comp, 'text') else {}),
-                                **({"html": comp.html} if hasattr(comp, 'html') else {}),
-                                **({"button_text": comp.button_text} if hasattr(comp, 'button_text') else {}),
-                                **({"variant": comp.variant} if hasattr(comp, 'variant') else {}),
-                                **({"checked_value": comp.checked_value} if hasattr(comp, 'checked_value') else {}),
-                                **({"unchecked_value": comp.unchecked_value} if hasattr(comp, 'unchecked_value') else {}),
-                            }
-                            for comp in group.components
-                        ],
-                        "collapsible": group.collapsible,
-                        "collapsed": group.collapsed,
-                        "styling": group.styling
-                    }
-                    for group in (self.ui_config.groups or [])
-                ],
-                "global_styling": self.ui_config.global_styling,
-                "layout": self.ui_config.layout,
-                "columns": self.ui_config.columns,
-                "dialog_config": {
-                    "title": self.ui_config.dialog_config.title if self.ui_config.dialog_config else None,
-                    "description": self.ui_config.dialog_config.description if self.ui_config.dialog_config else None,
-                    "width": self.ui_config.dialog_config.width if self.ui_config.dialog_config else None,
-                    "height": self.ui_config.dialog_config.height if self.ui_config.dialog_config else None,
-                    "background_color": self.ui_config.dialog_config.background_color if self.ui_config.dialog_config else None,
-                    "border_color": self.ui_config.dialog_config.border_color if self.ui_config.dialog_config else None,
-                    "text_color": self.ui_config.dialog_config.text_color if self.ui_config.dialog_config else None,
-                    "icon": self.ui_config.dialog_config.icon if self.ui_config.dialog_config else None,
-                    "icon_color": self.ui_config.dialog_config.icon_color if self.ui_config.dialog_config else None,
-                    "header_background": self.ui_config.dialog_config.header_background if self.ui_config.dialog_config else None,
-                    "footer_background": self.ui_config.dialog_config.footer_background if self.ui_config.dialog_config else None,
-                    "button_primary_color": self.ui_config.dialog_config.button_primary_color if self.ui_config.dialog_config else None,
-                    "button_secondary_color": self.ui_config.dialog_config.button_secondary_color if self.ui_config.dialog_config else None,
-                } if self.ui_config.dialog_config else None
-            } if self.ui_config else None
+            "styling": self._styling_dict,
+            "ui_config": self._ui_config_dict
         }
     
     def run(self, inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -5,13 +5,11 @@ Supports operators: equals, contains, starts_with, ends_with.
 Outputs two sockets: "true" and "false" to enable branching.
 """
 
-from typing import Dict, Any, List, Optional
-import sys
-import os
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from functools import lru_cache
+import re
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, is_error_output, extract_error_message
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, detect_error
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_text_input, create_select, create_checkbox,
@@ -19,98 +17,161 @@ from ui_components import (
 )
 
 
-class ConditionalNode(BaseNode):
-    """
-    Conditional Node - Evaluates a condition and routes accordingly.
+# Strings longer than this are lowercased directly rather than memoized, so the cache
+# never pins large message bodies in memory
+_LOWER_MEMO_MAX_LEN = 1024
 
-    Inputs:
-      - left (required): left-hand value (commonly connect from QueryNode's `query`).
-      - right (optional): right-hand value (alternatively use parameter `right_value`).
+# Lowercased copies of recently compared strings, so a value checked by several
+# case-insensitive conditions is lowercased once (keyed by value rather than id(), so a
+# recycled id can never return another string's copy)
+_lower_memo = lru_cache(maxsize=256)(str.lower)
 
-    Parameters:
-      - operator: equals | contains | starts_with | ends_with
-      - right_value: literal right-hand value if not provided via input
-      - case_sensitive: compare with case sensitivity (default False)
 
-    Outputs:
-      - true: emits the `left` value when condition is True (for branching)
-      - false: emits the `left` value when condition is False (for branching)
-      - condition: boolean result for downstream logic or inspection
+def _lower(value: str) -> str:
+    return _lower_memo(value) if len(value) <= _LOWER_MEMO_MAX_LEN else value.lower()
+
+
+def _ci_equals(left: str, right: str) -> bool:
+    """Case-insensitive equals; ASCII strings of different lengths never get lowercased"""
+    if left.isascii() and right.isascii():
+        return len(left) == len(right) and _lower(left) == _lower(right)
+    return _lower(left) == _lower(right)
+
+
+@lru_cache(maxsize=256)
+def _compiled_matcher(right: str) -> "re.Pattern[str]":
+    return re.compile(re.escape(right), re.IGNORECASE)
+
+
+def _contains_matcher(right: str) -> "re.Pattern[str]":
+    """Case-insensitive literal matcher for an ASCII right-hand value, compiled once per short value"""
+    if len(right) <= _LOWER_MEMO_MAX_LEN:
+        return _compiled_matcher(right)
+    return re.compile(re.escape(right), re.IGNORECASE)
+
+
+def _ci_contains(left: str, right: str) -> bool:
+    """Case-insensitive contains; ASCII values are searched in place without lowercasing left"""
+    if not right:
+        return True
+    if left.isascii() and right.isascii():
+        return len(right) <= len(left) and _contains_matcher(right).search(left) is not None
+    return _lower(right) in _lower(left)
+
+
+def _ci_starts_with(left: str, right: str) -> bool:
+    """Case-insensitive starts_with; ASCII only lowercases the prefix-sized slice of left"""
+    if left.isascii() and right.isascii():
+        n = len(right)
+        return n <= len(left) and left[:n].lower() == _lower(right)
+    return _lower(left).startswith(_lower(right))
+
+
+def _ci_ends_with(left: str, right: str) -> bool:
+    """Case-insensitive ends_with; ASCII only lowercases the suffix-sized slice of left"""
+    if left.isascii() and right.isascii():
+        n = len(right)
+        return n <= len(left) and left[len(left) - n:].lower() == _lower(right)
+    return _lower(left).endswith(_lower(right))
+
+
+# Comparison for each operator, by case sensitivity (unicode lowercasing can change
+# lengths, so the length shortcuts in the case-insensitive helpers are ASCII-only)
+_OPS = {
+    "equals": str.__eq__,
+    "contains": lambda left, right: right in left,
+    "starts_with": str.startswith,
+    "ends_with": str.endswith,
+}
+_CI_OPS = {
+    "equals": _ci_equals,
+    "contains": _ci_contains,
+    "starts_with": _ci_starts_with,
+    "ends_with": _ci_ends_with,
+}
+
+
+# Plain-string inputs starting with one of these prefixes are upstream errors
+_ERR_RE = re.compile(r"\s*(?:Error|ERROR|error):")
+
+
+def _input_error(value: Any, side: str) -> Optional[str]:
+    """Error message carried by an input value, or None if it isn't an error"""
+    if isinstance(value, dict):
+        message = detect_error(value)
+        if message is not None:
+            return message or f"Error in {side} input"
+    elif isinstance(value, str) and _ERR_RE.match(value):
+        return value
+    return None
+
+
+# String spellings of a true case_sensitive flag; the common casings skip the lower() call
+_TRUTHY = frozenset(("true", "True", "TRUE", "1", "yes", "Yes", "YES", "on", "On", "ON"))
+
+
+def _case_sensitive(value: Any) -> bool:
+    """Interpret the case_sensitive parameter - could be bool, string "true"/"false", or other"""
+    if type(value) is bool:
+        return value
+    if isinstance(value, str):
+        # Handle string values like "true", "True", "false", "False"
+        return value in _TRUTHY or value.lower() in _TRUTHY
+    # For any other type, convert to bool
+    return bool(value)
+
+
+def _as_str(value: Any) -> str:
+    """String form of an input value (string inputs, the common case, are used as-is)"""
+    return value if type(value) is str else ("" if value is None else str(value))
+
+
+def _evaluate(operator: str, left: str, right: str, case_sensitive: bool) -> bool:
+    """Evaluate a condition (unknown operators fall back to a safe False)"""
+    compare = (_OPS if case_sensitive else _CI_OPS).get(operator)
+    return compare(left, right) if compare else False
+
+
+def _error_output(error_message: str) -> Dict[str, Any]:
+    return {
+        "condition": False,
+        "true": "",
+        "false": "",
+        "success": False,
+        "metadata": {
+            "error": error_message
+        }
+    }
+
+
+def _branch_output(result: bool, left_str: str) -> Dict[str, Any]:
+    """Emit only the active branch to avoid multiple-path routing conflicts"""
+    output: Dict[str, Any] = {"condition": result}
+    if result:
+        output["true"] = left_str
+    else:
+        output["false"] = left_str
+    return output
+
+
+def batch_evaluate(lefts: Iterable[Any], right: Any, operator: str, case_sensitive: bool = False) -> List[bool]:
     """
+    Evaluate one condition against many left-hand values (e.g. routing a batch of queries).
     
-    def _define_required_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> List[str]:
-        """No credentials required for ConditionalNode"""
-        return []
-    
-    def _define_category(self) -> str:
-        """Define category for ConditionalNode"""
-        return "Logic"
+    The operator lookup and right-hand conversion happen once for the whole batch, and
+    values are not memoized since a batch rarely repeats.
+    """
+    lefts = list(lefts)
+    compare = (_OPS if case_sensitive else _CI_OPS).get(operator) if isinstance(operator, str) else None
+    if compare is None:
+        return [False] * len(lefts)
+    right_str = _as_str(right)
+    return [compare(_as_str(left), right_str) for left in lefts]
 
-    def _define_inputs(self) -> List[NodeInput]:
-        return [
-            NodeInput(
-                name="left",
-                type="string",
-                description="Left-hand value to evaluate (e.g., user query)",
-                required=True,
-            ),
-            NodeInput(
-                name="right",
-                type="string",
-                description="Optional right-hand value; if absent, uses parameter right_value",
-                required=False,
-            ),
-        ]
-
-    def _define_outputs(self) -> List[NodeOutput]:
-        return [
-            NodeOutput(
-                name="true",
-                type="string",
-                description="Pass-through when condition True (for branching)",
-            ),
-            NodeOutput(
-                name="false",
-                type="string",
-                description="Pass-through when condition False (for branching)",
-            ),
-            NodeOutput(
-                name="condition",
-                type="boolean",
-                description="Boolean result of the evaluation",
-            ),
-        ]
-
-    def _define_parameters(self) -> List[NodeParameter]:
-        return [
-            NodeParameter(
-                name="operator",
-                type="string",
-                description="Comparison operator",
-                required=True,
-                default_value="contains",
-                options=["equals", "contains", "starts_with", "ends_with"],
-            ),
-            NodeParameter(
-                name="right_value",
-                type="string",
-                description="Literal right-hand value (used if input `right` not connected)",
-                required=False,
-                default_value="",
-            ),
-            NodeParameter(
-                name="case_sensitive",
-                type="boolean",
-                description="Enable case-sensitive comparison",
-                required=False,
-                default_value=False,
-            ),
-        ]
 
-    def _define_styling(self) -> NodeStyling:
-        # Custom HTML to render a diamond shape with amber accent
-        return NodeStyling(
-            html_template="""
+# Node card markup and styles, built once at import; the CSS is whitespace-collapsed so the
+# schema sent to the UI carries it minified
+_HTML_TEMPLATE = """
             <div class=\"cond-node-outer\">
                 <div class=\"cond-node-inner\">
                     <div class=\"cond-icon\">
@@ -122,8 +183,9 @@ class ConditionalNode(BaseNode):
                     </div>
                 </div>
             </div>
-            """,
-            custom_css="""
+            """
+
+_CUSTOM_CSS = re.sub(r"\s+", " ", """
             .cond-node-outer {
                 width: 120px; height: 120px; position: relative;
                 background: #1f1f1f;
@@ -180,10 +242,114 @@ class ConditionalNode(BaseNode):
                 text-align: center;
                 white-space: nowrap;
             }
-            """,
-            icon="<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"24\" height=\"24\" viewBox=\"0 0 24 24\" fill=\"none\" stroke=\"currentColor\" stroke-width=\"2\" stroke-linecap=\"round\" stroke-linejoin=\"round\" class=\"lucide lucide-git-branch\"><line x1=\"6\" x2=\"6\" y1=\"3\" y2=\"15\"/><circle cx=\"18\" cy=\"6\" r=\"3\"/><circle cx=\"6\" cy=\"18\" r=\"3\"/><path d=\"M18 9a9 9 0 0 1-9 9\"/></svg>", subtitle="IF/ELSE", background_color="#1f1f1f", border_color="#f59e0b", text_color="#ffffff",
-            shape="rounded", width=120, height=120, css_classes="", inline_styles='{}', icon_position=""
-        )
+            """).strip()
+
+
+class ConditionalNode(BaseNode):
+    """
+    Conditional Node - Evaluates a condition and routes accordingly.
+
+    Inputs:
+      - left (required): left-hand value (commonly connect from QueryNode's `query`).
+      - right (optional): right-hand value (alternatively use parameter `right_value`).
+
+    Parameters:
+      - operator: equals | contains | starts_with | ends_with
+      - right_value: literal right-hand value if not provided via input
+      - case_sensitive: compare with case sensitivity (default False)
+
+    Outputs:
+      - true: emits the `left` value when condition is True (for branching)
+      - false: emits the `left` value when condition is False (for branching)
+      - condition: boolean result for downstream logic or inspection
+    """
+    
+    # Definitions are static, so they are built once at import time
+    _INPUTS: Tuple[NodeInput, ...] = (
+        NodeInput(
+            name="left",
+            type="string",
+            description="Left-hand value to evaluate (e.g., user query)",
+            required=True,
+        ),
+        NodeInput(
+            name="right",
+            type="string",
+            description="Optional right-hand value; if absent, uses parameter right_value",
+            required=False,
+        ),
+    )
+
+    _OUTPUTS: Tuple[NodeOutput, ...] = (
+        NodeOutput(
+            name="true",
+            type="string",
+            description="Pass-through when condition True (for branching)",
+        ),
+        NodeOutput(
+            name="false",
+            type="string",
+            description="Pass-through when condition False (for branching)",
+        ),
+        NodeOutput(
+            name="condition",
+            type="boolean",
+            description="Boolean result of the evaluation",
+        ),
+    )
+
+    _PARAMETERS: Tuple[NodeParameter, ...] = (
+        NodeParameter(
+            name="operator",
+            type="string",
+            description="Comparison operator",
+            required=True,
+            default_value="contains",
+            options=["equals", "contains", "starts_with", "ends_with"],
+        ),
+        NodeParameter(
+            name="right_value",
+            type="string",
+            description="Literal right-hand value (used if input `right` not connected)",
+            required=False,
+            default_value="",
+        ),
+        NodeParameter(
+            name="case_sensitive",
+            type="boolean",
+            description="Enable case-sensitive comparison",
+            required=False,
+            default_value=False,
+        ),
+    )
+
+    # Custom HTML to render a diamond shape with amber accent
+    _STYLING = NodeStyling(
+        html_template=_HTML_TEMPLATE,
+        custom_css=_CUSTOM_CSS,
+        icon="<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"24\" height=\"24\" viewBox=\"0 0 24 24\" fill=\"none\" stroke=\"currentColor\" stroke-width=\"2\" stroke-linecap=\"round\" stroke-linejoin=\"round\" class=\"lucide lucide-git-branch\"><line x1=\"6\" x2=\"6\" y1=\"3\" y2=\"15\"/><circle cx=\"18\" cy=\"6\" r=\"3\"/><circle cx=\"6\" cy=\"18\" r=\"3\"/><path d=\"M18 9a9 9 0 0 1-9 9\"/></svg>", subtitle="IF/ELSE", background_color="#1f1f1f", border_color="#f59e0b", text_color="#ffffff",
+        shape="rounded", width=120, height=120, css_classes="", inline_styles='{}', icon_position=""
+    )
+    
+    def _define_required_credentials(self, parameters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """No credentials required for ConditionalNode"""
+        return []
+    
+    def _define_category(self) -> str:
+        """Define category for ConditionalNode"""
+        return "Logic"
+
+    def _define_inputs(self) -> Tuple[NodeInput, ...]:
+        return self._INPUTS
+
+    def _define_outputs(self) -> Tuple[NodeOutput, ...]:
+        return self._OUTPUTS
+
+    def _define_parameters(self) -> Tuple[NodeParameter, ...]:
+        return self._PARAMETERS
+
+    def _define_styling(self) -> NodeStyling:
+        return self._STYLING
 
     def _define_ui_config(self) -> NodeUIConfig:
         return NodeUIConfig(
@@ -251,85 +417,57 @@ class ConditionalNode(BaseNode):
         if right_value is None:
             right_value = parameters.get("right_value", "")
 
-        # Check if inputs are error outputs
-        error_detected = False
-        error_message = None
-        
-        # Check left input
-        if isinstance(left_value, dict) and is_error_output(left_value):
-            error_detected = True
-            error_message = extract_error_message(left_value) or "Error in left input"
-        elif isinstance(left_value, str) and left_value.strip().startswith(("Error:", "ERROR:", "error:")):
-            error_detected = True
-            error_message = left_value
-        
-        # Check right input
-        if not error_detected:
-            if isinstance(right_value, dict) and is_error_output(right_value):
-                error_detected = True
-                error_message = extract_error_message(right_value) or "Error in right input"
-            elif isinstance(right_value, str) and right_value.strip().startswith(("Error:", "ERROR:", "error:")):
-                error_detected = True
-                error_message = right_value
-        
-        # If error detected, propagate it
-        if error_detected:
-            return {
-                "condition": False,
-                "true": "",
-                "false": "",
-                "success": False,
-                "metadata": {
-                    "error": error_message or "An error occurred in input"
-                }
-            }
+        # Propagate an error from either input (left first)
+        for side, value in (("left", left_value), ("right", right_value)):
+            error_message = _input_error(value, side)
+            if error_message is not None:
+                return _error_output(error_message)
 
         operator = parameters.get("operator", "contains")
-        case_sensitive_param = parameters.get("case_sensitive", False)
-        
-        # Handle case_sensitive parameter - could be bool, string "true"/"false", or other
-        if isinstance(case_sensitive_param, bool):
-            case_sensitive = case_sensitive_param
-        elif isinstance(case_sensitive_param, str):
-            # Handle string values like "true", "True", "false", "False"
-            case_sensitive = case_sensitive_param.lower() in ("true", "1", "yes", "on")
-        else:
-            # For any other type, convert to bool
-            case_sensitive = bool(case_sensitive_param)
+        case_sensitive = _case_sensitive(parameters.get("case_sensitive", False))
 
         # Prepare values
-        left_str = "" if left_value is None else str(left_value)
-        right_str = "" if right_value is None else str(right_value)
-
-        if not case_sensitive:
-            left_cmp = left_str.lower()
-            right_cmp = right_str.lower()
-        else:
-            left_cmp = left_str
-            right_cmp = right_str
-
-        # Evaluate
-        if operator == "equals":
-            result = left_cmp == right_cmp
-        elif operator == "contains":
-            result = right_cmp in left_cmp
-        elif operator == "starts_with":
-            result = left_cmp.startswith(right_cmp)
-        elif operator == "ends_with":
-            result = left_cmp.endswith(right_cmp)
-        else:
-            # Fallback safe default
-            result = False
+        left_str = _as_str(left_value)
+        result = _evaluate(operator, left_str, _as_str(right_value), case_sensitive) if isinstance(operator, str) else False
 
         # Expose for template
         self.node_data = {"operator": operator}
 
-        # Emit only the active branch to avoid multiple-path routing conflicts
-        output: Dict[str, Any] = {"condition": result}
-        if result:
-            output["true"] = left_str
-        else:
-            output["false"] = left_str
-        return output
+        return _branch_output(result, left_str)
+
+    def batch_execute(self, inputs_list: List[Dict[str, Any]], parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Route many inputs through the same condition (e.g. a batch of queries).
+
+        Items compared against the right_value parameter are evaluated in one
+        batch_evaluate call; items with their own "right" input go through execute().
+        Each output matches what execute() returns for that item.
+        """
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(inputs_list)
+        right_value = parameters.get("right_value", "")
+        right_error = _input_error(right_value, "right")
+        batch_index: List[int] = []
+        lefts: List[str] = []
+        for i, inputs in enumerate(inputs_list):
+            if inputs.get("right") is not None:
+                outputs[i] = self.execute(inputs, parameters)
+                continue
+            left_value = inputs.get("left", "")
+            error_message = _input_error(left_value, "left")
+            if error_message is None:
+                error_message = right_error
+            if error_message is not None:
+                outputs[i] = _error_output(error_message)
+                continue
+            batch_index.append(i)
+            lefts.append(_as_str(left_value))
 
+        operator = parameters.get("operator", "contains")
+        case_sensitive = _case_sensitive(parameters.get("case_sensitive", False))
+        results = batch_evaluate(lefts, right_value, operator, case_sensitive)
+        for i, left_str, result in zip(batch_index, lefts, results):
+            outputs[i] = _branch_output(result, left_str)
 
+        # Expose for template
+        self.node_data = {"operator": operator}
+        return outputs
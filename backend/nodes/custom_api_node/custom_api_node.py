@@ -4,15 +4,11 @@ This node allows making custom API calls with configurable methods, headers, and
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 import requests
 import json
 import re
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_text_input, create_textarea, create_select, create_label, UIOption
@@ -4,14 +4,10 @@ This node allows you to inspect messages/data at any point in the workflow.
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 import json
 from datetime import datetime
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_label, create_divider,
@@ -4,12 +4,9 @@ This node loads documents (PDF, DOCX, TXT, MD) and extracts text content.
 """
 
 from typing import Dict, Any, List, Optional
-import sys
 import os
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_text_input, create_select, create_label, create_divider, create_file_upload,
@@ -4,12 +4,8 @@ This node sends emails using configured email services (Resend, etc.).
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_text_input, create_textarea, create_select, create_label, create_divider,
@@ -18,8 +14,7 @@ from ui_components import (
 
 # Import email services
 try:
-    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'email_services'))
-    from resend_service.resend_service import ResendService
+    from email_services.resend_service.resend_service import ResendService
 except ImportError:
     ResendService = None
 
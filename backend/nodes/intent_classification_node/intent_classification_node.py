@@ -3,17 +3,9 @@ Intent Classification Node - Classifies user queries into predefined intent cate
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 import json
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Add the tools directory to the path
-sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'tools', 'language_model_tool'))
-
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_select, create_textarea, create_slider, create_number_input,
@@ -21,7 +13,7 @@ from ui_components import (
 )
 
 try:
-    from language_model_tool import LanguageModelTool
+    from tools.language_model_tool.language_model_tool import LanguageModelTool
 except ImportError:
     LanguageModelTool = None
 
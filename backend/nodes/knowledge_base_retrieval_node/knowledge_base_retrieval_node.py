@@ -5,17 +5,12 @@ This node retrieves relevant documents from a knowledge base using semantic sear
 It takes a query as input and returns the best matched results with context.
 """
 
-import sys
-import os
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add the parent directory to the path to import services
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from nodes.base_node import BaseNode, NodeStyling, NodeInput, NodeOutput, NodeParameter
 from tools.knowledge_base_retriever_tool.knowledge_base_retriever_tool import KnowledgeBaseRetrieverTool
 from ui_components import (
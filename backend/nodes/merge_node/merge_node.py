@@ -4,12 +4,8 @@ This node merges outputs from two different nodes with an optional separator.
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, is_error_output, extract_error_message
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, detect_error
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_text_input, create_label
@@ -195,18 +191,20 @@ class MergeNode(BaseNode):
         error_message = None
         
         # Check input1
-        if isinstance(input1, dict) and is_error_output(input1):
+        input1_error = detect_error(input1) if isinstance(input1, dict) else None
+        if input1_error is not None:
             error_detected = True
-            error_message = extract_error_message(input1) or "Error in input1"
+            error_message = input1_error or "Error in input1"
         elif isinstance(input1, str) and input1.strip().startswith(("Error:", "ERROR:", "error:")):
             error_detected = True
             error_message = input1
         
         # Check input2
         if not error_detected:
-            if isinstance(input2, dict) and is_error_output(input2):
+            input2_error = detect_error(input2) if isinstance(input2, dict) else None
+            if input2_error is not None:
                 error_detected = True
-                error_message = extract_error_message(input2) or "Error in input2"
+                error_message = input2_error or "Error in input2"
             elif isinstance(input2, str) and input2.strip().startswith(("Error:", "ERROR:", "error:")):
                 error_detected = True
                 error_message = input2
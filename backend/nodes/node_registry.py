@@ -34,6 +34,13 @@ class NodeRegistry:
         if node_instance:
             return node_instance.get_schema()
         return None
+    
+    def get_node_schema_json(self, name: str) -> Optional[bytes]:
+        """Get schema for a specific node as serialized JSON."""
+        node_instance = self.create_node(name)
+        if node_instance:
+            return node_instance.get_schema_json()
+        return None
 
 
 # Global registry instance
@@ -4,12 +4,8 @@ This node formats and returns the final response to the user.
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 
-# Add the parent directory to the path to import base_node and ui_components
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, is_error_output, extract_error_message
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling, is_error_output, extract_error_message
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_label, create_divider,
@@ -3,25 +3,16 @@ Summary Node - Summarizes large content using chunking and tree-like combination
 """
 
 from typing import Dict, Any, List, Optional
-import sys
-import os
 import re
 import math
 
-# Add the parent directory to the path to import base_node
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter, NodeStyling
 from ui_components import (
     NodeUIConfig, UIGroup, DialogConfig,
     create_label, create_divider, create_select, create_slider,
     UIOption
 )
 
-# Add backend root to path to import language model services
-BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if BACKEND_DIR not in sys.path:
-    sys.path.append(BACKEND_DIR)
-
 try:
     from language_model_services.openai_service.openai_service import OpenAIService
     from language_model_services.groq_service.groq_service import GroqService
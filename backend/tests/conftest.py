@@ -0,0 +1,76 @@
+"""Shared fixtures for the backend test suite."""
+
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _ensure_llm_services() -> None:
+    """Stand in for language model service clients whose SDKs aren't installed.
+
+    api.v1.nodes imports the OpenAI, Groq and Ollama services at module level; the flow
+    tests never call them, so a placeholder is enough when the SDK is missing.
+    """
+    for module_name, class_name in (
+        ("language_model_services.openai_service.openai_service", "OpenAIService"),
+        ("language_model_services.groq_service.groq_service", "GroqService"),
+        ("language_model_services.ollama_service.ollama_service", "OllamaService"),
+    ):
+        try:
+            __import__(module_name)
+        except ImportError:
+            module = types.ModuleType(module_name)
+            setattr(module, class_name, type(class_name, (), {}))
+            sys.modules[module_name] = module
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the SQLite database at a fresh file for the duration of a test."""
+    import db
+
+    db.close_connections()
+    monkeypatch.setattr(db, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(db, "SQLITE_DB_PATH", tmp_path / "workflows.db")
+    db._schema_cache.clear()
+    yield db
+    db.close_connections()
+    db._schema_cache.clear()
+
+
+@pytest.fixture
+def nodes_api():
+    """The nodes API module, with the built-in nodes used by the flow tests registered."""
+    _ensure_llm_services()
+    from nodes.node_registry import register_node
+    from nodes.query_node.query_node import QueryNode
+    from nodes.response_node.response_node import ResponseNode
+    from nodes.conditional_node.conditional_node import ConditionalNode
+    from nodes.text_transform_node.text_transform_node import TextTransformNode
+    from nodes.merge_node.merge_node import MergeNode
+    import api.v1.nodes as nodes_api
+
+    for node_class in (QueryNode, ResponseNode, ConditionalNode, TextTransformNode, MergeNode):
+        register_node(node_class)
+    return nodes_api
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Redirect file uploads to a temporary directory."""
+    import api.v1.files as files
+
+    monkeypatch.setattr(files, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(files, "_UPLOAD_DIR_ABS", str(tmp_path) + os.sep)
+    # Start from an empty, unbuilt file index so each test sees only its own uploads
+    monkeypatch.setattr(files, "_file_index", {})
+    monkeypatch.setattr(files, "_file_index_ready", False)
+    monkeypatch.setattr(files, "_min_mtime", float("inf"))
+    return tmp_path
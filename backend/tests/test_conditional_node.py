@@ -0,0 +1,87 @@
+"""ConditionalNode: operators, case handling, error propagation and batch routing."""
+
+import pytest
+
+from nodes.conditional_node.conditional_node import ConditionalNode, batch_evaluate
+
+
+@pytest.fixture
+def node():
+    return ConditionalNode()
+
+
+def run(node, left, right, operator="contains", case_sensitive=False):
+    params = {"operator": operator, "right_value": right, "case_sensitive": case_sensitive}
+    return node.execute({"left": left}, params)
+
+
+@pytest.mark.parametrize("operator, left, right, expected", [
+    ("equals", "Hello", "hello", True),
+    ("equals", "Hello", "hell", False),
+    ("contains", "I want a REFUND", "refund", True),
+    ("contains", "Hello", "bye", False),
+    ("starts_with", "Hello world", "HELLO", True),
+    ("ends_with", "Hello world", "WORLD", True),
+    ("ends_with", "Hello world", "hello", False),
+    ("contains", "Straße", "STRASSE", False),
+    ("contains", "ÉCOLE", "école", True),
+    ("unknown", "Hello", "Hello", False),
+])
+def test_case_insensitive_operators(node, operator, left, right, expected):
+    assert run(node, left, right, operator)["condition"] is expected
+
+
+@pytest.mark.parametrize("flag", [True, "true", "Yes", 1])
+def test_case_sensitive_flag(node, flag):
+    assert run(node, "Hello", "hello", "equals", case_sensitive=flag)["condition"] is False
+
+
+def test_only_the_active_branch_is_emitted(node):
+    assert run(node, "Hello", "ell") == {"condition": True, "true": "Hello"}
+    assert run(node, "Hello", "xyz") == {"condition": False, "false": "Hello"}
+
+
+def test_right_input_overrides_right_value(node):
+    output = node.execute({"left": "Hello", "right": "lo"}, {"operator": "ends_with", "right_value": "zz"})
+
+    assert output["condition"] is True
+
+
+def test_error_input_is_propagated(node):
+    output = run(node, "Error: upstream failed", "x")
+
+    assert output["success"] is False
+    assert output["metadata"]["error"] == "Error: upstream failed"
+
+
+def test_batch_execute_matches_execute(node):
+    params = {"operator": "contains", "right_value": "refund"}
+    inputs_list = [
+        {"left": "I want a refund"},
+        {"left": "hello"},
+        {"left": "Error: boom"},
+        {"left": "starts here", "right": "start"},
+        {"left": 42},
+        {},
+    ]
+
+    assert node.batch_execute(inputs_list, params) == [node.execute(i, params) for i in inputs_list]
+
+
+def test_batch_evaluate_handles_unknown_operators():
+    assert batch_evaluate(["a", "b"], "a", "equals") == [True, False]
+    assert batch_evaluate(["a", "b"], "a", "nope") == [False, False]
+
+
+def test_long_values_are_not_memoized(node):
+    from nodes.conditional_node import conditional_node
+
+    conditional_node._lower_memo.cache_clear()
+    conditional_node._compiled_matcher.cache_clear()
+    long_text = "Ünïcode " * 1000
+
+    assert run(node, long_text, long_text, "equals")["condition"] is True
+    assert run(node, long_text, long_text, "contains")["condition"] is True
+
+    assert conditional_node._lower_memo.cache_info().currsize == 0
+    assert conditional_node._compiled_matcher.cache_info().currsize == 0
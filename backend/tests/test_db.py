@@ -0,0 +1,86 @@
+"""SQLite connection handling in db.get_connection."""
+
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def db(sqlite_db):
+    with sqlite_db.get_connection() as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+    return sqlite_db
+
+
+def names(db):
+    with db.get_connection() as conn:
+        return [row["name"] for row in conn.execute("SELECT name FROM items ORDER BY name")]
+
+
+def test_connections_are_reused(db):
+    with db.get_connection() as first:
+        pass
+    with db.get_connection() as second:
+        pass
+
+    assert first is second
+
+
+def test_nested_use_joins_the_outer_transaction(db):
+    with pytest.raises(RuntimeError):
+        with db.get_connection() as outer:
+            outer.execute("INSERT INTO items VALUES ('outer')")
+            with db.get_connection() as inner:
+                assert inner is outer
+                inner.execute("INSERT INTO items VALUES ('inner')")
+            assert outer.in_transaction  # the inner exit did not commit
+            raise RuntimeError("roll back the outer work")
+
+    assert names(db) == []
+
+
+def test_interleaved_coroutines_get_separate_transactions(db):
+    seen = []
+
+    async def write_then_fail():
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO items VALUES ('dropped')")
+            await asyncio.sleep(0.01)
+            raise RuntimeError("roll back")
+
+    async def read():
+        with db.get_connection() as conn:
+            seen.append(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+    async def scenario():
+        return await asyncio.gather(write_then_fail(), read(), return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert seen == [0]
+    assert names(db) == []
+
+
+def test_threads_get_separate_connections(db):
+    used = []
+
+    def worker_body():
+        with db.get_connection() as conn:
+            used.append(conn)
+
+    with db.get_connection() as outer:
+        worker = threading.Thread(target=worker_body)
+        worker.start()
+        worker.join()
+
+    assert used and used[0] is not outer
+
+
+def test_close_connections_closes_connections_in_use(db):
+    with db.get_connection() as conn:
+        db.close_connections()
+
+    with pytest.raises(Exception):
+        conn.execute("SELECT 1")
+    assert db._sqlite_idle == []
@@ -0,0 +1,63 @@
+"""Node output error detection (detect_error and its wrappers)."""
+
+import pytest
+
+from nodes.base_node import detect_error, extract_error_message, is_error_output
+
+
+@pytest.mark.parametrize("output", [
+    {"query": "Hello World"},
+    {"response": "The error rate was low"},
+    {"success": True, "text": "done"},
+    {"metadata": {"error": ""}},
+    {},
+])
+def test_regular_outputs_are_not_errors(output):
+    assert detect_error(output) is None
+    assert is_error_output(output) is False
+    assert extract_error_message(output) is None
+
+
+def test_non_dict_output_is_not_an_error():
+    assert detect_error("Error: not a dict") is None
+
+
+def test_metadata_error_is_the_preferred_message():
+    output = {"response": "Error: from response", "metadata": {"error": "from metadata"}}
+
+    assert detect_error(output) == "from metadata"
+
+
+def test_success_false_without_message_uses_default():
+    assert detect_error({"success": False}) == "An error occurred during node execution"
+
+
+@pytest.mark.parametrize("prefix", ["Error:", "ERROR:", "error:"])
+def test_error_prefix_flags_output(prefix):
+    output = {"response": f"  {prefix} service unavailable"}
+
+    assert detect_error(output) == output["response"]
+
+
+def test_error_phrase_flags_output():
+    output = {"status": "Search error: index not found"}
+
+    assert detect_error(output) == output["status"]
+
+
+def test_any_string_field_can_flag_an_error():
+    # Detection looks at every string value, not only the usual message fields
+    output = {"custom_field": "Error: upstream failed"}
+
+    assert is_error_output(output) is True
+    assert extract_error_message(output) == "An error occurred during node execution"
+
+
+def test_message_comes_from_the_most_preferred_field():
+    output = {
+        "text": "Error: from text",
+        "status": "Error: from status",
+        "error": "Error: from error",
+    }
+
+    assert detect_error(output) == "Error: from error"
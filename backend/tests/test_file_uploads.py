@@ -0,0 +1,288 @@
+"""Upload validation: allowed extensions, size limit, and where accepted files land."""
+
+import asyncio
+import errno
+from contextlib import asynccontextmanager
+import os
+import io
+import tempfile
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+import api.v1.files as files
+
+
+@pytest.fixture
+def client(upload_dir):
+    app = FastAPI()
+    app.include_router(files.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("filename", ["notes.md", "REPORT.PDF", "a.b.docx", "dir/readme.markdown"])
+def test_allowed_extensions(filename):
+    assert files.is_allowed_file(filename)
+
+
+@pytest.mark.parametrize("filename", [".md", "dir/.pdf", "notes", "notes.exe", "notes.md.exe", "md"])
+def test_rejected_filenames(filename):
+    assert not files.is_allowed_file(filename)
+
+
+def test_upload_is_stored_in_its_shard(client, upload_dir):
+    response = client.post("/files/upload", files={"file": ("notes.txt", b"hello", "text/plain")})
+
+    assert response.status_code == 200
+    stored = response.json()["file"]
+    assert stored["size"] == 5
+    assert stored["extension"] == ".txt"
+    shard = stored["stored_name"][:files.SHARD_PREFIX_LEN]
+    assert (upload_dir / shard / stored["stored_name"]).read_bytes() == b"hello"
+
+
+def test_disallowed_extension_is_rejected(client, upload_dir):
+    response = client.post("/files/upload", files={"file": ("run.exe", b"MZ", "application/octet-stream")})
+
+    assert response.status_code == 400
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_oversized_upload_leaves_no_shard_directory(client, upload_dir, monkeypatch):
+    monkeypatch.setattr(files, "MAX_FILE_SIZE", 4)
+
+    response = client.post("/files/upload", files={"file": ("notes.txt", b"too large", "text/plain")})
+
+    assert response.status_code == 413
+    assert "too large" in response.json()["detail"]
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_oversized_spooled_upload_is_rejected(client, upload_dir, monkeypatch):
+    # Bodies over SMALL_UPLOAD_THRESHOLD go through the spooled form parser instead
+    monkeypatch.setattr(files, "SMALL_UPLOAD_THRESHOLD", 0)
+    monkeypatch.setattr(files, "MAX_FILE_SIZE", 4)
+
+    response = client.post("/files/upload", files={"file": ("notes.txt", b"too large", "text/plain")})
+
+    assert response.status_code == 413
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_oversized_content_length_is_rejected_up_front(client, upload_dir, monkeypatch):
+    monkeypatch.setattr(files, "MAX_FILE_SIZE", 4)
+    monkeypatch.setattr(files, "MULTIPART_OVERHEAD", 0)
+
+    response = client.post("/files/upload", files={"file": ("notes.txt", b"too large", "text/plain")})
+
+    assert response.status_code == 413
+
+
+def _multipart_chunks(payload: bytes):
+    yield b'--xx\r\nContent-Disposition: form-data; name="file"; filename="notes.txt"\r\n'
+    yield b"Content-Type: text/plain\r\n\r\n"
+    for i in range(0, len(payload), 1024):
+        yield payload[i:i + 1024]
+    yield b"\r\n--xx--\r\n"
+
+
+def test_chunked_upload_is_stored(client, upload_dir):
+    response = client.post(
+        "/files/upload",
+        content=_multipart_chunks(b"x" * 5000),
+        headers={"content-type": "multipart/form-data; boundary=xx"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["file"]["size"] == 5000
+
+
+def test_chunked_upload_is_cut_off_at_the_limit(client, upload_dir, monkeypatch):
+    monkeypatch.setattr(files, "MAX_FILE_SIZE", 2048)
+    monkeypatch.setattr(files, "MULTIPART_OVERHEAD", 0)
+
+    response = client.post(
+        "/files/upload",
+        content=_multipart_chunks(b"x" * 64 * 1024),
+        headers={"content-type": "multipart/form-data; boundary=xx"},
+    )
+
+    assert response.status_code == 413
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_limited_stream_stops_reading_past_the_limit(monkeypatch):
+    monkeypatch.setattr(files, "MAX_FILE_SIZE", 2048)
+    monkeypatch.setattr(files, "MULTIPART_OVERHEAD", 0)
+    consumed = []
+
+    class FakeRequest:
+        async def stream(self):
+            for _ in range(100):
+                consumed.append(1024)
+                yield b"x" * 1024
+
+    async def drain():
+        async for _ in files._limited_stream(FakeRequest()):
+            pass
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(drain())
+
+    assert excinfo.value.status_code == 413
+    assert len(consumed) == 3
+
+
+def _copy(src, tmp_path):
+    dest = tmp_path / "copy.txt"
+    size = src.seek(0, 2)
+    files._copy_upload(src, str(dest), size, bytearray(4))
+    return dest.read_bytes()
+
+
+def test_copy_upload_from_rolled_over_spool(tmp_path):
+    with tempfile.SpooledTemporaryFile(max_size=1) as src:
+        src.write(b"on disk content")
+
+        assert _copy(src, tmp_path) == b"on disk content"
+
+
+def test_copy_upload_from_in_memory_spool_does_not_roll_it_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(files.os, "sendfile", lambda *args: pytest.fail("sendfile used"), raising=False)
+    with tempfile.SpooledTemporaryFile(max_size=1024) as src:
+        src.write(b"in memory")
+
+        assert _copy(src, tmp_path) == b"in memory"
+        assert isinstance(src._file, io.BytesIO)
+
+
+def test_copy_upload_falls_back_when_sendfile_fails(tmp_path, monkeypatch):
+    # macOS can't sendfile into a regular file
+    def sendfile(*args):
+        raise OSError(errno.ENOTSOCK, "Socket operation on non-socket")
+
+    monkeypatch.setattr(files, "_HAS_SENDFILE", True)
+    monkeypatch.setattr(files.os, "sendfile", sendfile, raising=False)
+    with tempfile.TemporaryFile() as src:
+        src.write(b"copied without sendfile")
+
+        assert _copy(src, tmp_path) == b"copied without sendfile"
+
+
+def test_cleanup_triggers_inside_the_window_share_one_deferred_run(monkeypatch):
+    runs = []
+
+    async def fake_cleanup():
+        runs.append(time.monotonic())
+        return files._cleanup_result(0, 0)
+
+    monkeypatch.setattr(files, "_cleanup_old_files_batched", fake_cleanup)
+    monkeypatch.setattr(files, "CLEANUP_COALESCE_SECONDS", 0.2)
+
+    async def scenario():
+        files.start_cleanup_worker()
+        try:
+            assert files.schedule_cleanup() is True
+            await asyncio.sleep(0.05)
+            # Both arrive within the window of the first run: neither is dropped
+            assert files.schedule_cleanup() is True
+            assert files.schedule_cleanup() is True
+            await asyncio.sleep(0.4)
+        finally:
+            await files.stop_cleanup_worker()
+
+    asyncio.run(scenario())
+
+    assert len(runs) == 2
+    assert runs[1] - runs[0] >= 0.15
+
+
+def test_cleanup_endpoint_reports_when_nothing_was_queued(client):
+    response = client.post("/files/cleanup")
+
+    assert response.status_code == 503
+    assert response.json()["queued"] is False
+
+
+def test_cleanup_endpoint_queues_on_the_worker_started_by_the_lifespan(upload_dir, monkeypatch):
+    ran = []
+
+    async def fake_cleanup():
+        ran.append(True)
+        return files._cleanup_result(0, 0)
+
+    monkeypatch.setattr(files, "_cleanup_old_files_batched", fake_cleanup)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Same start/stop as main.lifespan
+        files.start_cleanup_worker()
+        yield
+        await files.stop_cleanup_worker()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(files.router)
+    with TestClient(app) as client:
+        response = client.post("/files/cleanup")
+        for _ in range(50):
+            if ran:
+                break
+            time.sleep(0.01)
+
+    assert response.status_code == 202
+    assert response.json()["queued"] is True
+    assert ran == [True]
+
+
+def test_small_multipart_parse_picks_the_file_part():
+    body = (
+        b'--xx\r\nContent-Disposition: form-data; name="note"\r\n\r\nignored\r\n'
+        b'--xx\r\nContent-Disposition: form-data; name="file"; filename="a.md"\r\n'
+        b"Content-Type: text/markdown\r\n\r\n# title\r\n--xx--\r\n"
+    )
+
+    assert files._parse_small_multipart(body, "multipart/form-data; boundary=xx") == ("a.md", b"# title")
+
+
+def test_stats_report_created_at_from_ctime(client, upload_dir):
+    stored = client.post("/files/upload", files={"file": ("notes.txt", b"hello", "text/plain")}).json()["file"]
+    path = upload_dir / stored["stored_name"][:files.SHARD_PREFIX_LEN] / stored["stored_name"]
+    week_ago = time.time() - 7 * 24 * 60 * 60
+    os.utime(path, (week_ago, week_ago))
+    # Rebuild the index from disk
+    files._file_index.clear()
+    files._file_index_ready = False
+
+    listed = client.get("/files/stats").json()["stats"]["files"]
+
+    assert [f["name"] for f in listed] == [stored["stored_name"]]
+    assert listed[0]["created_at"] == files._format_timestamp(path.stat().st_ctime)
+    assert listed[0]["age_days"] > 6.9
+
+
+def test_spooled_upload_works_across_event_loops(upload_dir, monkeypatch):
+    # Each TestClient runs the app on a fresh event loop; the buffer pool must not care
+    monkeypatch.setattr(files, "SMALL_UPLOAD_THRESHOLD", 0)
+    app = FastAPI()
+    app.include_router(files.router)
+
+    for _ in range(2):
+        with TestClient(app) as fresh_client:
+            response = fresh_client.post("/files/upload", files={"file": ("notes.txt", b"hello", "text/plain")})
+            assert response.status_code == 200
+
+    assert len(files._BUF_POOL) == files.UPLOAD_BUFFER_POOL_SIZE
+
+
+def test_buffer_pool_allocates_when_empty_and_never_grows(monkeypatch):
+    monkeypatch.setattr(files, "_BUF_POOL", files.deque())
+
+    buf = files._borrow_buffer()
+    assert len(buf) == files.UPLOAD_CHUNK_SIZE
+
+    files._return_buffer(buf)
+    for _ in range(files.UPLOAD_BUFFER_POOL_SIZE + 3):
+        files._return_buffer(bytearray(1))
+    assert len(files._BUF_POOL) == files.UPLOAD_BUFFER_POOL_SIZE
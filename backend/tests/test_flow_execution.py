@@ -0,0 +1,260 @@
+"""Flow executor: Kahn level scheduling, branch routing, concurrency and error handling."""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter
+from nodes.node_registry import register_node
+
+
+QUERY = {"type": "QueryNode", "parameters": {"query": "Hello World"}}
+RESPONSE = {"type": "ResponseNode"}
+
+
+def edge(src: str, output: str, dst: str, input_name: str) -> Dict[str, Any]:
+    return {"from": {"node": src, "output": output}, "to": {"node": dst, "input": input_name}}
+
+
+def transform(operation: str) -> Dict[str, Any]:
+    return {"type": "TextTransformNode", "parameters": {"operation": operation}}
+
+
+class _PassThroughNode(BaseNode):
+    """Test node copying its 'query' input to its 'query' output"""
+
+    def _define_inputs(self) -> List[NodeInput]:
+        return [NodeInput(name="query", type="string", description="Value")]
+
+    def _define_outputs(self) -> List[NodeOutput]:
+        return [NodeOutput(name="query", type="string", description="Value")]
+
+    def _define_parameters(self) -> List[NodeParameter]:
+        return []
+
+    def execute(self, inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return {"query": inputs["query"]}
+
+
+# Both RendezvousNodes in a flow have to be running at the same time to get past this
+_rendezvous = threading.Barrier(2, timeout=5)
+
+
+class RendezvousNode(_PassThroughNode):
+    """Test node that only finishes once a second RendezvousNode is running concurrently"""
+
+    def execute(self, inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        _rendezvous.wait()
+        return super().execute(inputs, parameters)
+
+
+class FailingNode(_PassThroughNode):
+    """Test node that always raises"""
+
+    def execute(self, inputs: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def client(nodes_api):
+    register_node(RendezvousNode)
+    register_node(FailingNode)
+    app = FastAPI()
+    app.include_router(nodes_api.router)
+    return TestClient(app)
+
+
+def test_linear_flow_returns_response_node_output(client):
+    payload = {
+        "nodes": {"q": QUERY, "t": transform("uppercase"), "r": RESPONSE},
+        "edges": [edge("q", "query", "t", "query"), edge("t", "query", "r", "input_data")],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert sorted(data["executed_nodes"]) == ["q", "r", "t"]
+    assert data["skipped_nodes"] == []
+    assert "HELLO WORLD" in str(data["response_inputs"]["r"])
+
+
+def test_conditional_skips_the_inactive_branch(client):
+    payload = {
+        "nodes": {
+            "q": QUERY,
+            "c": {"type": "ConditionalNode", "parameters": {"operator": "contains", "right_value": "bye"}},
+            "up": transform("uppercase"),
+            "low": transform("lowercase"),
+            "r": RESPONSE,
+        },
+        "edges": [
+            edge("q", "query", "c", "left"),
+            edge("c", "true", "up", "query"),
+            edge("c", "false", "low", "query"),
+            edge("low", "query", "r", "input_data"),
+        ],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert "up" in data["skipped_nodes"]
+    assert "low" in data["executed_nodes"]
+    assert "hello world" in str(data["response_inputs"]["r"])
+
+
+def test_fan_in_node_runs_after_all_upstream_nodes(client):
+    payload = {
+        "nodes": {
+            "q": QUERY,
+            "a": transform("uppercase"),
+            "b": transform("lowercase"),
+            "m": {"type": "MergeNode"},
+            "r": RESPONSE,
+        },
+        "edges": [
+            edge("q", "query", "a", "query"),
+            edge("q", "query", "b", "query"),
+            edge("a", "query", "m", "input1"),
+            edge("b", "query", "m", "input2"),
+            edge("m", "query", "r", "input_data"),
+        ],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 200
+    result = str(response.json()["data"]["response_inputs"]["r"])
+    assert "HELLO WORLD" in result and "hello world" in result
+
+
+def test_nodes_in_the_same_level_run_concurrently(client):
+    payload = {
+        "nodes": {
+            "q": QUERY,
+            "a": {"type": "RendezvousNode"},
+            "b": {"type": "RendezvousNode"},
+            "m": {"type": "MergeNode"},
+            "r": RESPONSE,
+        },
+        "edges": [
+            edge("q", "query", "a", "query"),
+            edge("q", "query", "b", "query"),
+            edge("a", "query", "m", "input1"),
+            edge("b", "query", "m", "input2"),
+            edge("m", "query", "r", "input_data"),
+        ],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    # Run one after the other, the first node would time out waiting at the barrier
+    assert response.status_code == 200, response.json()
+    assert {"a", "b"} <= set(response.json()["data"]["executed_nodes"])
+
+
+def test_cycle_is_reported_as_unresolved(client):
+    payload = {
+        "nodes": {"q": QUERY, "a": transform("uppercase"), "b": transform("lowercase"), "r": RESPONSE},
+        "edges": [
+            edge("q", "query", "a", "query"),
+            edge("a", "query", "b", "query"),
+            edge("b", "query", "a", "query"),
+            edge("b", "query", "r", "input_data"),
+        ],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 400
+    assert sorted(response.json()["detail"]["unresolved_nodes"]) == ["a", "b", "r"]
+
+
+def test_failed_node_does_not_release_its_dependents(client):
+    payload = {
+        "nodes": {"q": QUERY, "f": {"type": "FailingNode"}, "r": RESPONSE},
+        "edges": [edge("q", "query", "f", "query"), edge("f", "query", "r", "input_data")],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["unresolved_nodes"] == ["r"]
+
+
+def test_node_exception_is_reported_per_node(client):
+    payload = {
+        "nodes": {"q": QUERY, "f": {"type": "FailingNode"}, "r": RESPONSE},
+        "edges": [edge("q", "query", "f", "query"), edge("q", "query", "r", "input_data")],
+    }
+    response = client.post("/nodes/execute", json=payload)
+
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert detail["errors"] == {"f": "boom"}
+    assert sorted(detail["executed_nodes"]) == ["q", "r"]
+
+
+def test_missing_query_or_response_node_is_rejected(client):
+    response = client.post("/nodes/execute", json={"nodes": {"t": transform("uppercase")}, "edges": []})
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["has_query_node"] is False
+
+
+def test_run_flow_returns_a_plain_dict(nodes_api):
+    payload = {"nodes": {"q": QUERY, "r": RESPONSE}, "edges": [edge("q", "query", "r", "input_data")]}
+
+    result = asyncio.run(nodes_api.run_flow(payload))
+
+    assert result["success"] is True
+    assert set(result["data"]) == {"response_inputs", "executed_nodes", "skipped_nodes", "errors"}
+
+
+def _flow_data(count: int, consumed: List[str]) -> Dict[str, Any]:
+    class RecordingDict(dict):
+        def items(self):
+            for key, value in super().items():
+                consumed.append(key)
+                yield key, value
+
+    return {
+        "response_inputs": RecordingDict((f"r{i}", {"text": "x" * 100}) for i in range(count)),
+        "executed_nodes": ["q"],
+        "skipped_nodes": [],
+        "errors": {},
+    }
+
+
+def test_small_flow_result_is_one_body(nodes_api):
+    data = _flow_data(3, [])
+
+    response = nodes_api._flow_result_response({"success": True, "data": data})
+
+    assert not isinstance(response, StreamingResponse)
+    assert json.loads(response.body) == {"success": True, "data": data}
+
+
+def test_large_flow_result_is_serialized_while_streaming(nodes_api, monkeypatch):
+    monkeypatch.setattr(nodes_api, "FLOW_STREAM_THRESHOLD", 1000)
+    consumed: List[str] = []
+    data = _flow_data(50, consumed)
+
+    response = nodes_api._flow_result_response({"success": True, "data": data})
+
+    assert isinstance(response, StreamingResponse)
+    # Only the entries needed to pass the threshold have been serialized so far
+    assert len(consumed) < 15
+
+    async def body() -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    assert json.loads(asyncio.run(body())) == {"success": True, "data": data}
+    assert len(consumed) == 50
+
+
+@pytest.mark.parametrize("name, level", [("debug", 10), (" INFO ", 20), ("warning", 30), ("verbose", 30), ("", 30)])
+def test_nodes_log_level_falls_back_to_warning(nodes_api, name, level):
+    assert nodes_api._log_level(name) == level
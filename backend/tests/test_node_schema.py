@@ -0,0 +1,70 @@
+"""Node schema caching: shared per class, rebuilt per instance after invalidate_schema."""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import orjson
+
+from nodes.base_node import BaseNode, NodeInput, NodeOutput, NodeParameter
+
+
+class EchoNode(BaseNode):
+    """Test node with one input and one output"""
+
+    def _define_inputs(self) -> List[NodeInput]:
+        return [NodeInput(name="query", type="string", description="Value")]
+
+    def _define_outputs(self) -> List[NodeOutput]:
+        return [NodeOutput(name="query", type="string", description="Value")]
+
+    def _define_parameters(self) -> List[NodeParameter]:
+        return []
+
+    def execute(self, inputs, parameters):
+        return {"query": inputs["query"]}
+
+
+def test_schema_is_built_once_per_class():
+    first, second = EchoNode(), EchoNode()
+
+    assert first.get_schema() is second.get_schema()
+    assert first.get_schema()["node_id"] == "echonode"
+
+
+def test_schema_json_matches_the_schema():
+    node = EchoNode()
+
+    assert orjson.loads(node.get_schema_json()) == orjson.loads(orjson.dumps(node.get_schema()))
+
+
+def test_invalidate_schema_rebuilds_only_that_instance():
+    changed, untouched = EchoNode(), EchoNode()
+
+    changed.outputs = changed.outputs + (NodeOutput(name="extra", type="string", description="Extra"),)
+    changed.invalidate_schema()
+
+    assert [o["name"] for o in changed.get_schema()["outputs"]] == ["query", "extra"]
+    assert b'"extra"' in changed.get_schema_json()
+    assert [o["name"] for o in untouched.get_schema()["outputs"]] == ["query"]
+
+
+def test_node_modules_leave_sys_path_alone():
+    # Fresh interpreter, so every node module really gets imported
+    script = (
+        "import glob, importlib, sys\n"
+        "before = list(sys.path)\n"
+        "for path in sorted(glob.glob('nodes/*/*_node.py')):\n"
+        "    try:\n"
+        "        importlib.import_module(path[:-3].replace('/', '.'))\n"
+        "    except ImportError:\n"
+        "        pass  # optional SDK missing; the sys.path check still holds\n"
+        "assert 'nodes.base_node' in sys.modules\n"
+        "assert sys.path == before, set(sys.path) - set(before)\n"
+    )
+    backend_dir = Path(__file__).resolve().parent.parent
+
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend_dir, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,54 @@
+"""GET /nodes/models/{service}: service instances and model lists cached per credentials."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class FakeService:
+    created = []
+    result = {"service": "openai", "models": ["gpt"]}
+
+    def __init__(self):
+        FakeService.created.append(self)
+
+    def get_models(self):
+        return FakeService.result
+
+
+@pytest.fixture
+def client(nodes_api, monkeypatch):
+    FakeService.created = []
+    FakeService.result = {"service": "openai", "models": ["gpt"]}
+    monkeypatch.setitem(nodes_api._SERVICE_CLASSES, "openai", FakeService)
+    monkeypatch.setattr(nodes_api, "_services", {})
+    monkeypatch.setattr(nodes_api, "_models_cache", {})
+    monkeypatch.setenv("OPENAI_API_KEY", "key-1")
+    app = FastAPI()
+    app.include_router(nodes_api.router)
+    return TestClient(app)
+
+
+def test_models_are_served_from_cache(client):
+    first = client.get("/nodes/models/openai").json()
+    FakeService.result = {"service": "openai", "models": ["changed"]}
+
+    assert client.get("/nodes/models/openai").json() == first
+    assert len(FakeService.created) == 1
+
+
+def test_rotated_key_creates_a_new_service(client, monkeypatch):
+    client.get("/nodes/models/openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "key-2")
+    FakeService.result = {"service": "openai", "models": ["new"]}
+
+    assert client.get("/nodes/models/openai").json()["data"]["models"] == ["new"]
+    assert len(FakeService.created) == 2
+
+
+def test_error_results_are_not_cached(client):
+    FakeService.result = {"service": "openai", "error": "unreachable"}
+    client.get("/nodes/models/openai")
+    FakeService.result = {"service": "openai", "models": ["gpt"]}
+
+    assert client.get("/nodes/models/openai").json()["data"]["models"] == ["gpt"]
@@ -0,0 +1,179 @@
+"""Workflows API on SQLite: untitled naming SQL, summary columns and migrations."""
+
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1 import workflows
+
+
+GRAPH = {
+    "nodes": [
+        {"id": "q", "data": {"nodeSchema": {"node_id": "querynode", "name": "QueryNode",
+                                            "styling": {"icon": "<svg>q</svg>"}}}},
+        {"id": "r", "data": {"nodeSchema": {"node_id": "responsenode", "name": "ResponseNode",
+                                            "styling": {"background_color": "#0f0"}}}},
+    ]
+}
+
+
+@pytest.fixture
+def client(sqlite_db):
+    workflows.init_db()
+    with sqlite_db.get_connection() as conn:
+        conn.execute(
+            "CREATE TABLE deployments (id TEXT PRIMARY KEY, workflow_id TEXT NOT NULL, is_active INTEGER DEFAULT 1)"
+        )
+    workflows.invalidate_workflow_list()
+    app = FastAPI()
+    app.include_router(workflows.router)
+    return TestClient(app)
+
+
+def save(client, name="", data=None):
+    response = client.post("/workflows/", json={"name": name, "data": data or {"nodes": []}})
+    assert response.status_code == 200
+    return response.json()["data"]["name"]
+
+
+def test_empty_names_get_sequential_untitled_names(client):
+    assert save(client) == "Untitled 1"
+    assert save(client, "   ") == "Untitled 2"
+    assert save(client, "My flow") == "My flow"
+    assert save(client) == "Untitled 3"
+
+
+def test_untitled_numbering_continues_after_the_highest_number(client):
+    save(client, "Untitled 9")
+    save(client, "Untitled 10")
+
+    assert save(client) == "Untitled 11"
+
+
+def test_names_that_only_look_untitled_are_ignored(client):
+    for name in ("Untitled x", "Untitled 5b", "Untitled", "Untitled -3"):
+        save(client, name)
+
+    assert save(client) == "Untitled 1"
+
+
+def test_list_reads_summaries_written_on_save(client):
+    save(client, "With nodes", GRAPH)
+
+    items = client.get("/workflows/").json()["data"]
+
+    assert items[0]["node_count"] == 2
+    assert [t["node_id"] for t in items[0]["node_types"]] == ["querynode", "responsenode"]
+    assert items[0]["node_types"][1]["icon_color"] == "#0f0"
+
+
+def test_init_db_backfills_summaries_of_older_rows(client, sqlite_db):
+    with sqlite_db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO workflows (id, name, data_json) VALUES (?, ?, ?)",
+            ("old", "Old flow", json.dumps(GRAPH)),
+        )
+
+    workflows.init_db()
+    with sqlite_db.get_connection() as conn:
+        row = conn.execute("SELECT node_types_json, node_count FROM workflows WHERE id = 'old'").fetchone()
+
+    assert row["node_count"] == 2
+    assert [t["node_id"] for t in json.loads(row["node_types_json"])] == ["querynode", "responsenode"]
+
+
+def test_get_workflow_returns_the_stored_graph(client):
+    response = client.post("/workflows/", json={"name": "Flow", "data": GRAPH})
+    workflow_id = response.json()["data"]["id"]
+
+    body = client.get(f"/workflows/{workflow_id}").json()
+
+    assert body["data"]["name"] == "Flow"
+    assert body["data"]["data"] == GRAPH
+    assert client.get("/workflows/missing").status_code == 404
+
+
+def test_list_query_reads_workflows_in_created_at_index_order(client, sqlite_db):
+    with sqlite_db.get_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + workflows._LIST_WORKFLOWS_QUERY))
+
+    assert "idx_workflows_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_numbered_untitled_names_are_unique(client):
+    assert save(client, "Flow") == save(client, "Flow") == "Flow"
+    save(client, "Untitled 4")
+
+    response = client.post("/workflows/", json={"name": "Untitled 4", "data": {"nodes": []}})
+
+    assert response.status_code == 409
+
+
+def test_renaming_to_a_taken_untitled_name_conflicts(client):
+    save(client)
+    workflow_id = client.post("/workflows/", json={"name": "Flow", "data": {"nodes": []}}).json()["data"]["id"]
+
+    response = client.put(f"/workflows/{workflow_id}", json={"name": "Untitled 1"})
+
+    assert response.status_code == 409
+
+
+def test_generated_name_is_retried_after_a_conflict(client, monkeypatch):
+    execute = workflows._execute
+    calls = []
+
+    def conflict_once(conn, query, params=()):
+        calls.append(query)
+        if len(calls) == 1:
+            raise sqlite3.IntegrityError("UNIQUE constraint failed: workflows.name")
+        return execute(conn, query, params)
+
+    monkeypatch.setattr(workflows, "_execute", conflict_once)
+
+    assert save(client) == "Untitled 1"
+    assert len(calls) == 2
+
+
+def test_init_db_renumbers_duplicate_untitled_names(client, sqlite_db):
+    with sqlite_db.get_connection() as conn:
+        conn.execute("DROP INDEX idx_workflows_untitled_unique")
+        conn.executemany(
+            "INSERT INTO workflows (id, name, data_json, created_at) VALUES (?, ?, '{}', ?)",
+            [("a", "Untitled 2", "2024-01-01"), ("b", "Untitled 2", "2024-01-02"), ("c", "Untitled 5", "2024-01-03")],
+        )
+
+    workflows.init_db()
+    with sqlite_db.get_connection() as conn:
+        names = dict(conn.execute("SELECT id, name FROM workflows").fetchall())
+        indexes = {row["name"] for row in conn.execute("PRAGMA index_list(workflows)")}
+
+    assert names == {"a": "Untitled 2", "b": "Untitled 6", "c": "Untitled 5"}
+    assert "idx_workflows_untitled_unique" in indexes
+
+
+def test_postgres_insert_uses_psycopg_placeholders():
+    # The queries are built at import time, so check them in an interpreter configured for Postgres
+    script = (
+        "import re\n"
+        "from api.v1 import workflows\n"
+        "query = workflows._INSERT_WORKFLOW_QUERY\n"
+        "assert workflows.USING_POSTGRES\n"
+        "assert '?' not in query\n"
+        "assert query.count('%s') == 5, query\n"
+        "assert re.search(r\"LIKE 'Untitled %%'\", query), query\n"
+        "assert re.sub(r'%[s%]', '', query).count('%') == 0, query\n"
+        "assert \"name ~ '^Untitled [0-9]+$'\" in workflows._NUMBERED_UNTITLED\n"
+    )
+    backend_dir = Path(__file__).resolve().parent.parent
+    env = {"POSTGRES_DB_URL_BASE": "postgresql://localhost/unused", "PATH": ""}
+
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend_dir, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
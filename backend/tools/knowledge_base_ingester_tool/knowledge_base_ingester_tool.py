@@ -5,7 +5,6 @@ This tool ingests documents into a vector database for semantic search.
 It uses OpenAI's text-embedding-3-large model for high-quality embeddings.
 """
 
-import sys
 import os
 import uuid
 from typing import Dict, Any, List, Optional
@@ -14,9 +13,6 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Add the parent directory to the path to import services
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 # Import services with error handling
 try:
     from vector_store_services.qdrant_service.qdrant_service import QdrantService, EmbeddingPayload
@@ -5,7 +5,6 @@ This tool retrieves relevant documents from a vector database using semantic sea
 It uses OpenAI's text-embedding-3-large model for high-quality embeddings.
 """
 
-import sys
 import os
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
@@ -13,9 +12,6 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Add the parent directory to the path to import services
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 # Import services with error handling
 try:
     from vector_store_services.qdrant_service.qdrant_service import QdrantService, SearchResult
@@ -2,13 +2,8 @@
 Simple Language Model Tool - Uses existing language model services
 """
 
-import sys
-import os
 from typing import Dict, Any, Optional
 
-# Add the parent directory to the path to import language model services
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 # Import services with error handling
 try:
     from language_model_services.openai_service.openai_service import OpenAIService
@@ -5,7 +5,7 @@ This module defines the UI components that can be used in node configurations
 to create dynamic, declarative user interfaces.
 """
 
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, ClassVar, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -51,6 +51,9 @@ class UIComponent:
     visible: bool = True
     validation: Optional[Dict[str, Any]] = None
     styling: Optional[Dict[str, Any]] = None
+    
+    # Component-specific fields included in the node schema
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ()
 
 
 @dataclass
@@ -69,6 +72,8 @@ class TextareaComponent(UIComponent):
     rows: int = 3
     max_length: Optional[int] = None
     min_length: Optional[int] = None
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("rows",)
 
 
 @dataclass
@@ -78,6 +83,8 @@ class SelectComponent(UIComponent):
     options: List[UIOption] = None
     multiple: bool = False
     searchable: bool = False
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("options", "multiple")
 
 
 @dataclass
@@ -87,6 +94,8 @@ class MultiSelectComponent(UIComponent):
     options: List[UIOption] = None
     searchable: bool = False
     max_selections: Optional[int] = None
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("options",)
 
 
 @dataclass
@@ -95,6 +104,8 @@ class CheckboxComponent(UIComponent):
     type: UIComponentType = UIComponentType.CHECKBOX
     checked_value: Any = True
     unchecked_value: Any = False
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("checked_value", "unchecked_value")
 
 
 @dataclass
@@ -103,6 +114,8 @@ class RadioComponent(UIComponent):
     type: UIComponentType = UIComponentType.RADIO
     options: List[UIOption] = None
     orientation: str = "vertical"  # "vertical" or "horizontal"
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("options",)
 
 
 @dataclass
@@ -142,6 +155,8 @@ class FileUploadComponent(UIComponent):
     multiple: bool = False
     max_file_size: Optional[int] = None  # in bytes
     max_files: Optional[int] = None
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("multiple",)
 
 
 @dataclass
@@ -159,6 +174,8 @@ class LabelComponent(UIComponent):
     type: UIComponentType = UIComponentType.LABEL
     text: str = ""
     html: bool = False  # Whether to render as HTML
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("text", "html")
 
 
 @dataclass
@@ -179,6 +196,8 @@ class ButtonComponent(UIComponent):
     variant: str = "primary"  # "primary", "secondary", "danger", "success"
     size: str = "medium"  # "small", "medium", "large"
     icon: Optional[str] = None
+    
+    _EXTRA_FIELDS: ClassVar[Tuple[str, ...]] = ("button_text", "variant")
 
 
 @dataclass